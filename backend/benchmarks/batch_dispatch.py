@@ -0,0 +1,74 @@
+"""Fleet ETA of greedy vs batch (Hungarian) dispatch on synthetic bursts.
+
+ETA is straight-line distance at a constant urban speed, the same cost the
+batch dispatcher optimizes. Run from the backend folder:
+
+    python -m benchmarks.batch_dispatch
+"""
+
+import random
+import time
+
+import numpy as np
+
+from utils.assignment import greedy_assignment, solve_assignment
+from utils.fleet_arrays import haversine_km
+
+SPEED_KMH = 40
+FLEET_SIZE = 60
+BURSTS = 200
+BURST_SIZES = [2, 4, 8, 16]
+CENTER_LAT, CENTER_LNG = 40.44, -79.94
+
+
+def make_burst(size: int):
+    fleet = np.array(
+        [
+            (CENTER_LAT + random.uniform(-0.1, 0.1), CENTER_LNG + random.uniform(-0.1, 0.1))
+            for _ in range(FLEET_SIZE)
+        ]
+    )
+    # A pile-up: events reported by cameras around one spot
+    lat = CENTER_LAT + random.uniform(-0.08, 0.08)
+    lng = CENTER_LNG + random.uniform(-0.08, 0.08)
+    events = np.array(
+        [
+            (lat + random.uniform(-0.01, 0.01), lng + random.uniform(-0.01, 0.01))
+            for _ in range(size)
+        ]
+    )
+    return fleet, events
+
+
+def fleet_eta_s(cost, rows, cols) -> float:
+    return float(cost[rows, cols].sum()) / SPEED_KMH * 3600
+
+
+def main() -> None:
+    random.seed(7)
+    print(f"{BURSTS} bursts per size, {FLEET_SIZE} idle units, {SPEED_KMH} km/h")
+    print(
+        f"{'events':>7} {'greedy ETA (s)':>15} {'batch ETA (s)':>14} "
+        f"{'saved':>7} {'solve (ms)':>11}"
+    )
+    for size in BURST_SIZES:
+        greedy_total = batch_total = solve_s = 0.0
+        for _ in range(BURSTS):
+            fleet, events = make_burst(size)
+            cost = haversine_km(
+                events[:, 0, None], events[:, 1, None], fleet[None, :, 0], fleet[None, :, 1]
+            )
+            greedy_total += fleet_eta_s(cost, *greedy_assignment(cost))
+            start = time.perf_counter()
+            rows, cols = solve_assignment(cost)
+            solve_s += time.perf_counter() - start
+            batch_total += fleet_eta_s(cost, rows, cols)
+        print(
+            f"{size:>7} {greedy_total / BURSTS:>15.0f} {batch_total / BURSTS:>14.0f} "
+            f"{(1 - batch_total / greedy_total) * 100:>6.1f}% "
+            f"{solve_s / BURSTS * 1000:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
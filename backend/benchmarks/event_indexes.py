@@ -0,0 +1,122 @@
+"""Query latency on a large events collection with and without the model indexes.
+
+Uses a scratch database (never the app's own) on the MongoDB server in
+BENCH_MONGODB_URL. Run from the backend folder:
+
+    BENCH_MONGODB_URL=mongodb://localhost:27017 python -m benchmarks.event_indexes [n_events]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import AsyncMongoClient
+
+from models import Ambulance, Camera, Event
+
+BENCH_MONGODB_URL = os.getenv("BENCH_MONGODB_URL", "mongodb://localhost:27017")
+BENCH_DATABASE_NAME = "lifeline_index_bench"
+DEFAULT_EVENTS = 1_000_000
+BATCH_SIZE = 10_000
+REPEATS = 20
+
+
+def make_events(count: int, ambulance_ids: list[ObjectId], camera_names: list[str]):
+    now = datetime.utcnow()
+    for i in range(count):
+        # Realistic skew: almost everything is resolved, a few are open
+        status = "resolved" if random.random() < 0.995 else random.choice(["open", "enroute"])
+        yield {
+            "severity": "emergency" if random.random() < 0.2 else "informational",
+            "title": f"Event {i}",
+            "description": "Synthetic benchmark event",
+            "reference_clip_url": "http://localhost/clip.mp4",
+            "lat": 40.44 + random.uniform(-0.05, 0.05),
+            "lng": -79.94 + random.uniform(-0.05, 0.05),
+            "camera_name": random.choice(camera_names),
+            "ambulance_id": random.choice(ambulance_ids) if status != "open" else None,
+            "status": status,
+            "created_at": now - timedelta(seconds=i),
+        }
+
+
+async def time_query(run) -> float:
+    """Median latency in milliseconds."""
+    samples = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        await run()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+async def run_queries(db, ambulance_ids, camera_names) -> dict[str, float]:
+    events, ambulances, cameras = db["events"], db["ambulances"], db["cameras"]
+    return {
+        "events by status": await time_query(
+            lambda: events.find({"status": "open"}).to_list()
+        ),
+        "open emergencies, newest first": await time_query(
+            lambda: events.find({"status": "open", "severity": "emergency"})
+            .sort("created_at", -1)
+            .to_list()
+        ),
+        "events for one ambulance": await time_query(
+            lambda: events.find({"ambulance_id": random.choice(ambulance_ids)}).to_list()
+        ),
+        "idle ambulances": await time_query(
+            lambda: ambulances.find({"status": "idle"}).to_list()
+        ),
+        "camera by name": await time_query(
+            lambda: cameras.find_one({"name": random.choice(camera_names)})
+        ),
+    }
+
+
+async def main() -> None:
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_EVENTS
+    client = AsyncMongoClient(BENCH_MONGODB_URL)
+    await client.drop_database(BENCH_DATABASE_NAME)
+    db = client[BENCH_DATABASE_NAME]
+
+    ambulance_ids = [ObjectId() for _ in range(500)]
+    camera_names = [f"CAM_{i}" for i in range(2000)]
+    await db["ambulances"].insert_many(
+        [
+            {"_id": amb_id, "name": f"AMB-{i}", "status": random.choice(["idle", "enroute"])}
+            for i, amb_id in enumerate(ambulance_ids)
+        ]
+    )
+    await db["cameras"].insert_many([{"name": name} for name in camera_names])
+
+    print(f"Inserting {n_events:,} events...")
+    batch = []
+    for event in make_events(n_events, ambulance_ids, camera_names):
+        batch.append(event)
+        if len(batch) == BATCH_SIZE:
+            await db["events"].insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        await db["events"].insert_many(batch, ordered=False)
+
+    without = await run_queries(db, ambulance_ids, camera_names)
+
+    for model in (Event, Ambulance, Camera):
+        await db[model.Settings.name].create_indexes(model.Settings.indexes)
+    with_indexes = await run_queries(db, ambulance_ids, camera_names)
+
+    print(f"{'query':<32} {'no index (ms)':>14} {'indexed (ms)':>13}")
+    for name, before in without.items():
+        print(f"{name:<32} {before:>14.2f} {with_indexes[name]:>13.2f}")
+
+    await client.drop_database(BENCH_DATABASE_NAME)
+    await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
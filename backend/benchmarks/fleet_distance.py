@@ -0,0 +1,83 @@
+"""Nearest-idle lookup: scalar haversine loop vs vectorized NumPy columns.
+
+Run from the backend folder:
+
+    python -m benchmarks.fleet_distance
+"""
+
+import random
+import time
+
+import numpy as np
+
+from models import AmbulanceStatus
+from utils.fleet_arrays import FleetArrays
+from utils.geo import calculate_distance
+
+FLEET_SIZES = [1_000, 10_000, 100_000]
+EVENTS = 50
+CENTER_LAT, CENTER_LNG = 40.44, -79.94
+
+
+def make_fleet(size: int):
+    fleet = []
+    for i in range(size):
+        fleet.append(
+            (
+                i,
+                CENTER_LAT + random.uniform(-0.3, 0.3),
+                CENTER_LNG + random.uniform(-0.3, 0.3),
+                random.choice(list(AmbulanceStatus)),
+            )
+        )
+    return fleet
+
+
+def loop_nearest(fleet, lat, lng):
+    best, best_distance = None, float("inf")
+    for key, amb_lat, amb_lng, status in fleet:
+        if status != AmbulanceStatus.IDLE:
+            continue
+        distance = calculate_distance(lat, lng, amb_lat, amb_lng)
+        if distance < best_distance:
+            best, best_distance = key, distance
+    return best
+
+
+def main() -> None:
+    events = [
+        (CENTER_LAT + random.uniform(-0.3, 0.3), CENTER_LNG + random.uniform(-0.3, 0.3))
+        for _ in range(EVENTS)
+    ]
+    print(f"{EVENTS} events per run")
+    print(f"{'units':>8} {'loop (ms/event)':>16} {'numpy (ms/event)':>17} {'numpy batch (ms/event)':>23}")
+    for size in FLEET_SIZES:
+        fleet = make_fleet(size)
+        arrays = FleetArrays(capacity=size)
+        for key, lat, lng, status in fleet:
+            arrays.upsert(key, lat, lng, status)
+
+        start = time.perf_counter()
+        expected = [loop_nearest(fleet, lat, lng) for lat, lng in events]
+        loop_ms = (time.perf_counter() - start) * 1000 / EVENTS
+
+        start = time.perf_counter()
+        single = [
+            arrays.nearest(lat, lng, k=1, status=AmbulanceStatus.IDLE)[0][1]
+            for lat, lng in events
+        ]
+        numpy_ms = (time.perf_counter() - start) * 1000 / EVENTS
+
+        start = time.perf_counter()
+        idle = arrays.mask(AmbulanceStatus.IDLE)
+        matrix = arrays.distances([e[0] for e in events], [e[1] for e in events])[:, idle]
+        idle_ids = np.asarray(arrays.ids)[idle]
+        batch = idle_ids[matrix.argmin(axis=1)].tolist()
+        batch_ms = (time.perf_counter() - start) * 1000 / EVENTS
+
+        assert expected == single == batch
+        print(f"{size:>8} {loop_ms:>16.3f} {numpy_ms:>17.3f} {batch_ms:>23.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compare the old per-socket send_json broadcast with the encode-once path.
+
+Run from the backend folder:
+
+    python -m benchmarks.live_broadcast
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime
+
+from beanie import PydanticObjectId
+from fastapi.encoders import jsonable_encoder
+
+from models import Ambulance, AmbulanceStatus
+from utils.live_ws import LiveFrame, encode_documents
+from utils.route_path import encode_path
+
+FLEET_SIZE = 200
+PATH_POINTS = 50
+CLIENT_COUNTS = [10, 100, 1000]
+ROUNDS = 3
+
+
+class FakeWebSocket:
+    """Accepts frames the way Starlette does, without any network I/O."""
+
+    def __init__(self) -> None:
+        self.sent_bytes = 0
+
+    async def send_json(self, data) -> None:
+        # Starlette's send_json serializes per call
+        text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+        self.sent_bytes += len(text)
+
+    async def send_text(self, data: str) -> None:
+        self.sent_bytes += len(data)
+
+
+def make_fleet() -> list[Ambulance]:
+    now = datetime.utcnow()
+    # model_construct skips Beanie's collection check, so no database is needed
+    return [
+        Ambulance.model_construct(
+            id=PydanticObjectId(),
+            lat=40.44 + i * 1e-4,
+            lng=-79.94 - i * 1e-4,
+            name=f"AMB-{i:03d}",
+            status=AmbulanceStatus.ENROUTE,
+            eta_seconds=300,
+            event_id=None,
+            updated_at=now,
+            path=encode_path([(40.44 + j * 1e-4, -79.94) for j in range(PATH_POINTS)]),
+            path_index=0,
+        )
+        for i in range(FLEET_SIZE)
+    ]
+
+
+async def old_path(fleet: list[Ambulance], sockets: list[FakeWebSocket]) -> None:
+    payload = {"type": "ambulances", "data": jsonable_encoder(fleet)}
+    for websocket in sockets:
+        await websocket.send_json(payload)
+
+
+async def new_path(fleet: list[Ambulance], sockets: list[FakeWebSocket]) -> None:
+    frame = LiveFrame(
+        {"type": "ambulances", "op": "upsert", "data": encode_documents(fleet), "seq": 1}
+    )
+    for websocket in sockets:
+        await websocket.send_text(frame.text)
+
+
+async def timed(fn, fleet, sockets) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        await fn(fleet, sockets)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def main() -> None:
+    fleet = make_fleet()
+    print(f"Fleet of {FLEET_SIZE} ambulances, {PATH_POINTS} path points each")
+    print(f"{'clients':>8} {'send_json (ms)':>16} {'encode once (ms)':>18} {'speedup':>8}")
+    for count in CLIENT_COUNTS:
+        sockets = [FakeWebSocket() for _ in range(count)]
+        old = await timed(old_path, fleet, sockets)
+        new = await timed(new_path, fleet, sockets)
+        print(f"{count:>8} {old * 1000:>16.1f} {new * 1000:>18.1f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
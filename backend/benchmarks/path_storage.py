@@ -0,0 +1,81 @@
+"""Ambulance document and broadcast size: point-list paths vs encoded polylines.
+
+Walks a cross-town route the way utils.ambulance does and totals what every
+tick writes to MongoDB (BSON) and broadcasts (JSON). Run from the backend folder:
+
+    python -m benchmarks.path_storage
+"""
+
+import random
+from datetime import datetime
+
+import bson
+import orjson
+from beanie import PydanticObjectId
+
+from models import Ambulance, AmbulanceStatus
+from utils.geo import straight_line_route
+from utils.route_path import encode_path
+
+ORIGIN, DESTINATION = (40.4406, -79.9959), (40.4850, -79.9200)
+
+
+def sizes(doc: dict) -> tuple[int, int]:
+    stored = {key: value for key, value in doc.items() if key != "_id"}
+    return len(bson.encode(stored)), len(orjson.dumps(doc))
+
+
+def main() -> None:
+    _, line = straight_line_route(*ORIGIN, *DESTINATION)
+    # Jitter the points so deltas vary like a real street route's would
+    rng = random.Random(1)
+    route = [
+        (lat + rng.uniform(-3e-4, 3e-4), lng + rng.uniform(-3e-4, 3e-4)) for lat, lng in line
+    ]
+    # model_construct skips Beanie's collection check; no database is needed
+    ambulance = Ambulance.model_construct(
+        id=PydanticObjectId(),
+        lat=ORIGIN[0],
+        lng=ORIGIN[1],
+        name="Ambulance 1",
+        status=AmbulanceStatus.ENROUTE,
+        event_id=PydanticObjectId(),
+        eta_seconds=600,
+        updated_at=datetime.utcnow(),
+        path=encode_path(route),
+        path_index=0,
+    )
+    base = ambulance.model_dump(mode="json", by_alias=True, exclude={"path", "path_index"})
+
+    totals = {"point list": [0, 0], "encoded polyline": [0, 0]}
+    first = {}
+    for index in range(len(route)):
+        docs = {
+            # Before: the remaining points were rewritten on every tick
+            "point list": {
+                **base,
+                "path": [{"lat": lat, "lng": lng} for lat, lng in route[index + 1 :]],
+            },
+            "encoded polyline": {**base, "path": ambulance.path, "path_index": index + 1},
+        }
+        for name, doc in docs.items():
+            document_bytes, broadcast_bytes = sizes(doc)
+            first.setdefault(name, (document_bytes, broadcast_bytes))
+            totals[name][0] += document_bytes
+            totals[name][1] += broadcast_bytes
+
+    print(f"Route of {len(route)} points, walked in {len(route)} ticks")
+    print(
+        f"{'path storage':<18} {'doc (B)':>9} {'message (B)':>12} "
+        f"{'all writes (KB)':>16} {'all messages (KB)':>18}"
+    )
+    for name, (document_total, broadcast_total) in totals.items():
+        document_bytes, broadcast_bytes = first[name]
+        print(
+            f"{name:<18} {document_bytes:>9} {broadcast_bytes:>12} "
+            f"{document_total / 1024:>16.1f} {broadcast_total / 1024:>18.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
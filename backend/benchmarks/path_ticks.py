@@ -0,0 +1,61 @@
+"""Simulation ticks per leg: one per polyline vertex vs simplified + resampled.
+
+Compares a dense urban polyline and a sparse highway one with the same
+ETA. Run from the backend folder:
+
+    python -m benchmarks.path_ticks
+"""
+
+import math
+import random
+
+from utils.geo import calculate_distance
+from utils.route_path import encode_path, resample_path, simplify_path
+
+ETA_S = 600
+TICK_S = 1.0
+
+
+def urban(rng: random.Random) -> list[tuple[float, float]]:
+    # ~1200 vertices: a street grid sampled every few metres, with GPS-like noise
+    points, lat, lng = [], 40.4406, -79.9959
+    for block in range(40):
+        horizontal = block % 2 == 0
+        for _ in range(30):
+            if horizontal:
+                lng += 0.00004
+            else:
+                lat += 0.00003
+            points.append((lat + rng.gauss(0, 5e-6), lng + rng.gauss(0, 5e-6)))
+    return points
+
+
+def highway() -> list[tuple[float, float]]:
+    # A few vertices kilometres apart
+    return [(40.4406, -79.9959), (40.47, -79.95), (40.50, -79.90), (40.53, -79.86)]
+
+
+def report(name: str, path: list[tuple[float, float]]) -> None:
+    simplified = simplify_path(path)
+    ticks = max(1, math.ceil(ETA_S / TICK_S))
+    positions = [path[0]] + [(lat, lng) for lat, lng, _ in resample_path(simplified, ticks)]
+    for label, tick_count, polyline_bytes, points in (
+        ("per vertex", len(path) - 1, len(encode_path(path)), path),
+        ("resampled", len(positions) - 1, len(encode_path(simplified)), positions),
+    ):
+        jumps = [calculate_distance(*a, *b) * 1000 for a, b in zip(points, points[1:])]
+        print(
+            f"{name + ', ' + label:<22} {tick_count:>7} {polyline_bytes:>15} "
+            f"{max(jumps):>14.0f}"
+        )
+
+
+def main() -> None:
+    print(f"Legs with a {ETA_S} s ETA, {TICK_S:.0f} s per tick")
+    print(f"{'route':<22} {'ticks':>7} {'polyline (B)':>15} {'max jump (m)':>14}")
+    report("urban", urban(random.Random(3)))
+    report("highway", highway())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Local road routing on a synthetic grid: ALT vs Dijkstra.
+
+Builds an N x N street grid (random per-edge travel times, a few one-way
+streets), writes it as a CSV edge list, loads it through RoadRouter.from_csv
+and reports queries per second for ALT and for Dijkstra stopping at the
+target. Correctness is covered by tests/test_road_router.py. Run from the
+backend folder:
+
+    python -m benchmarks.road_router
+"""
+
+import csv
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from utils.road_router import RoadRouter
+
+GRID_SIZES = [50, 100, 200]
+QUERIES = 200
+SPACING_DEG = 0.001
+ORIGIN_LAT, ORIGIN_LNG = 40.40, -79.99
+
+
+def write_grid(path: Path, size: int) -> None:
+    def node(i: int, j: int):
+        return f"{i}_{j}", ORIGIN_LAT + i * SPACING_DEG, ORIGIN_LNG + j * SPACING_DEG
+
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            ["source", "source_lat", "source_lng", "target", "target_lat", "target_lng", "seconds", "oneway"]
+        )
+        for i in range(size):
+            for j in range(size):
+                for di, dj in ((1, 0), (0, 1)):
+                    if i + di < size and j + dj < size:
+                        oneway = 1 if random.random() < 0.05 else 0
+                        writer.writerow(
+                            [*node(i, j), *node(i + di, j + dj), round(random.uniform(6, 20), 1), oneway]
+                        )
+
+
+def main() -> None:
+    random.seed(3)
+    print(f"{QUERIES} random queries per grid")
+    print(
+        f"{'nodes':>7} {'preprocess (s)':>15} {'dijkstra (q/s)':>15} {'ALT (q/s)':>10} {'speedup':>8}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in GRID_SIZES:
+            path = Path(tmp) / f"grid_{size}.csv"
+            write_grid(path, size)
+            start = time.perf_counter()
+            router = RoadRouter.from_csv(str(path))
+            preprocess_s = time.perf_counter() - start
+
+            # Same graph with no landmarks: A* degenerates to Dijkstra that
+            # stops at the target
+            plain = RoadRouter(
+                router.coords,
+                [(u, v, w) for u, out in enumerate(router._out) for v, w in out],
+                landmarks=0,
+            )
+
+            n = len(router.coords)
+            pairs = [(random.randrange(n), random.randrange(n)) for _ in range(QUERIES)]
+
+            start = time.perf_counter()
+            for s, t in pairs:
+                plain.shortest_path(s, t)
+            dijkstra_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for s, t in pairs:
+                router.shortest_path(s, t)
+            alt_s = time.perf_counter() - start
+
+            print(
+                f"{n:>7} {preprocess_s:>15.2f} {QUERIES / dijkstra_s:>15.0f} "
+                f"{QUERIES / alt_s:>10.0f} {dijkstra_s / alt_s:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Candidate ETAs: one computeRoutes call per pair vs batched computeRouteMatrix.
+
+Serves both endpoints from the local stub in benchmarks.routes_stub with a
+simulated provider latency, and checks the matrix against the stub's
+straight-line estimates. Run from the backend folder:
+
+    python -m benchmarks.route_matrix
+"""
+
+import asyncio
+import random
+import time
+
+import numpy as np
+
+import maps_call
+from benchmarks.routes_stub import STUB_PORT, RoutesStub, start_stub
+from utils.geo import estimate_travel_seconds
+from utils.route_guard import TokenBucket
+
+LATENCY_S = 0.05
+BASE_LAT, BASE_LNG = 40.4406, -79.9959
+
+
+def points(n: int, rng: random.Random) -> list[tuple[float, float]]:
+    return [
+        (BASE_LAT + rng.uniform(-0.05, 0.05), BASE_LNG + rng.uniform(-0.05, 0.05))
+        for _ in range(n)
+    ]
+
+
+async def per_pair(origins, destinations) -> np.ndarray:
+    async def one(origin, destination) -> float:
+        eta, _ = await maps_call.compute_route_eta_and_path(*origin, *destination)
+        return np.nan if eta is None else eta
+
+    etas = await asyncio.gather(*(one(o, d) for o in origins for d in destinations))
+    return np.array(etas, dtype=float).reshape(len(origins), len(destinations))
+
+
+async def main() -> None:
+    stub = RoutesStub(latency_s=LATENCY_S)
+    server = start_stub(stub)
+    maps_call.URL = f"http://127.0.0.1:{STUB_PORT}/directions/v2:computeRoutes"
+    maps_call.MATRIX_URL = f"http://127.0.0.1:{STUB_PORT}/distanceMatrix/v2:computeRouteMatrix"
+    maps_call.HEADERS["X-Goog-Api-Key"] = "bench"
+    maps_call.MATRIX_HEADERS["X-Goog-Api-Key"] = "bench"
+    # Measure the requests, not the route cache or the rate limit
+    maps_call.route_cache.max_size = 0
+    maps_call.rate_limiter = TokenBucket(rate_per_s=1e9, burst=10_000)
+    await maps_call.start_client()
+
+    rng = random.Random(7)
+    print(f"Local stub, {LATENCY_S * 1000:.0f} ms simulated latency per request")
+    print(f"{'case':<34} {'requests':>9} {'time (ms)':>10}")
+    for label, n_origins, n_destinations, compare in (
+        ("10 candidates x 1 event", 10, 1, True),
+        ("10 candidates x 5 events", 10, 5, True),
+        ("30 units x 30 events", 30, 30, False),
+    ):
+        origins = points(n_origins, rng)
+        destinations = points(n_destinations, rng)
+        expected = np.array(
+            [[round(estimate_travel_seconds(*o, *d)) for d in destinations] for o in origins]
+        )
+        runs = [("matrix", maps_call.compute_route_matrix)]
+        if compare:
+            runs.insert(0, ("per pair", per_pair))
+        for name, run in runs:
+            stub.requests = 0
+            start = time.perf_counter()
+            durations = await run(origins, destinations)
+            elapsed = (time.perf_counter() - start) * 1000
+            assert np.array_equal(durations, expected), name
+            print(f"{label + ', ' + name:<34} {stub.requests:>9} {elapsed:>10.1f}")
+
+    await maps_call.close_client()
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
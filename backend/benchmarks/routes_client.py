@@ -0,0 +1,79 @@
+"""Per-call Routes API latency: a new client per call vs the shared pool.
+
+Serves computeRoutes from the local HTTPS stub in benchmarks.routes_stub,
+so each fresh client pays a real TCP and TLS handshake. Run from the backend folder:
+
+    python -m benchmarks.routes_client
+"""
+
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+import maps_call
+from benchmarks.routes_stub import STUB_PORT, RoutesStub, start_stub
+from utils.route_guard import TokenBucket
+
+CALLS = 200
+ORIGIN, DESTINATION = (40.44, -79.94), (40.45, -79.94)
+BODY = {
+    "origin": {"location": {"latLng": {"latitude": ORIGIN[0], "longitude": ORIGIN[1]}}},
+    "destination": {
+        "location": {"latLng": {"latitude": DESTINATION[0], "longitude": DESTINATION[1]}}
+    },
+}
+
+
+async def new_client_per_call() -> None:
+    # What compute_route_eta_and_path used to do
+    async with httpx.AsyncClient(timeout=10.0, verify=False) as client:
+        response = await client.post(maps_call.URL, headers=maps_call.HEADERS, json=BODY)
+        response.raise_for_status()
+        response.json()
+
+
+async def shared_client() -> None:
+    eta, path = await maps_call.compute_route_eta_and_path(*ORIGIN, *DESTINATION)
+    assert eta and path
+
+
+async def measure(call) -> list[float]:
+    samples = []
+    for _ in range(CALLS):
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as cert_dir:
+        server = start_stub(RoutesStub(), cert_dir=Path(cert_dir))
+        maps_call.URL = f"https://127.0.0.1:{STUB_PORT}/directions/v2:computeRoutes"
+        maps_call.HEADERS["X-Goog-Api-Key"] = "bench"
+        # Measure the HTTP path, not the route cache or the rate limit
+        maps_call.route_cache.max_size = 0
+        maps_call.rate_limiter = TokenBucket(rate_per_s=1e9, burst=CALLS)
+        maps_call._client = maps_call.create_client(verify=False)
+
+        before = await measure(new_client_per_call)
+        after = await measure(shared_client)
+        await maps_call.close_client()
+        server.should_exit = True
+
+    print(f"{CALLS} sequential calls to a local HTTPS stub")
+    print(f"{'client':<20} {'median (ms)':>12} {'p95 (ms)':>10}")
+    for name, samples in (("new per call", before), ("shared pool", after)):
+        samples.sort()
+        print(
+            f"{name:<20} {statistics.median(samples):>12.2f} "
+            f"{samples[int(len(samples) * 0.95)]:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+"""Local stand-in for the Routes API (computeRoutes and computeRouteMatrix).
+
+Answers with straight-line estimates after an optional artificial latency,
+for benchmarks and for running the backend without an API key:
+
+    python -m benchmarks.routes_stub        # serves http://127.0.0.1:8799
+
+then set ROUTES_API_URL=http://127.0.0.1:8799/directions/v2:computeRoutes and
+ROUTES_MATRIX_URL=http://127.0.0.1:8799/distanceMatrix/v2:computeRouteMatrix.
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import polyline
+import uvicorn
+
+from utils.geo import estimate_travel_seconds, straight_line_route
+
+STUB_PORT = 8799
+# Simulated provider latency per request
+STUB_LATENCY_S = float(os.getenv("ROUTES_STUB_LATENCY_S", "0"))
+
+
+def _lat_lng(waypoint: dict) -> tuple[float, float]:
+    lat_lng = waypoint.get("waypoint", waypoint)["location"]["latLng"]
+    return lat_lng["latitude"], lat_lng["longitude"]
+
+
+def compute_routes(body: dict) -> dict:
+    eta, path = straight_line_route(*_lat_lng(body["origin"]), *_lat_lng(body["destination"]))
+    return {
+        "routes": [
+            {"duration": f"{eta}s", "polyline": {"encodedPolyline": polyline.encode(path)}}
+        ]
+    }
+
+
+def compute_route_matrix(body: dict) -> list[dict]:
+    elements = []
+    for i, origin in enumerate(body["origins"]):
+        for j, destination in enumerate(body["destinations"]):
+            seconds = round(estimate_travel_seconds(*_lat_lng(origin), *_lat_lng(destination)))
+            element = {"duration": f"{seconds}s", "condition": "ROUTE_EXISTS"}
+            # Like the real API, zero-valued indexes are left out
+            if i:
+                element["originIndex"] = i
+            if j:
+                element["destinationIndex"] = j
+            elements.append(element)
+    return elements
+
+
+class RoutesStub:
+    """ASGI app; counts requests so benchmarks can report them."""
+
+    def __init__(self, latency_s: float = STUB_LATENCY_S) -> None:
+        self.latency_s = latency_s
+        self.requests = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        self.requests += 1
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        body = json.loads(b"".join(chunks) or b"{}")
+        if scope["path"].endswith("computeRouteMatrix"):
+            payload = compute_route_matrix(body)
+        else:
+            payload = compute_routes(body)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": json.dumps(payload).encode()})
+
+
+def start_stub(
+    app: RoutesStub, port: int = STUB_PORT, cert_dir: Path | None = None
+) -> uvicorn.Server:
+    """Serve ``app`` from a background thread; HTTPS when ``cert_dir`` is given.
+
+    The certificate is self-signed, made with the openssl CLI.
+    """
+    ssl = {}
+    if cert_dir is not None:
+        key, cert = cert_dir / "key.pem", cert_dir / "cert.pem"
+        subprocess.run(
+            [
+                "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+                "-keyout", str(key), "-out", str(cert), "-days", "1", "-subj", "/CN=localhost",
+            ],
+            check=True,
+            capture_output=True,
+        )
+        ssl = {"ssl_keyfile": str(key), "ssl_certfile": str(cert)}
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="warning", **ssl))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+if __name__ == "__main__":
+    uvicorn.run(RoutesStub(), port=STUB_PORT)
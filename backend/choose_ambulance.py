@@ -1,8 +1,7 @@
 #!/usr/bin/env python3
-import math
-from schemas import Point
 from database import init_db
 import asyncio
+import os
 from pathlib import Path
 import sys
 
@@ -10,84 +9,302 @@ import sys
 # Allow imports from parent directory
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from models import Ambulance, AmbulanceStatus, Event, PydanticObjectId
+from models import Ambulance, AmbulanceStatus, Event, EventStatus, PydanticObjectId
 
 
 from datetime import datetime
 from models import Ambulance, AmbulanceStatus
-from maps_call import compute_route_eta_and_path
-
-
-def calculate_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-    """Calculate distance between two points in kilometers (Haversine formula)."""
-    R = 6371  # Earth radius in km
-    dlat = math.radians(lat2 - lat1)
-    dlng = math.radians(lng2 - lng1)
-    a = (
-        math.sin(dlat / 2) ** 2
-        + math.cos(math.radians(lat1))
-        * math.cos(math.radians(lat2))
-        * math.sin(dlng / 2) ** 2
-    )
-    c = 2 * math.asin(math.sqrt(a))
-    return R * c
+import numpy as np
 
+from maps_call import compute_route_eta_and_path, compute_route_matrix
+from utils.assignment import solve_assignment
+from utils.dispatch_batch import DispatchBatcher
+from utils.dispatch_queue import DispatchQueue
+from utils.fleet_state import fleet
+from utils.geo import STRAIGHT_DETOUR, STRAIGHT_SPEED_KMH
+from utils.route_path import decode_path, encode_path, simplify_path
+from utils.live_ws import broadcast_upsert
+from utils.travel_matrix import travel_matrix
 
-async def get_ambulance_and_path(event_id: PydanticObjectId):
+
+# "greedy" dispatches each emergency on its own; "batch" collects the
+# emergencies of a burst and assigns them together
+DISPATCH_MODE = os.getenv("DISPATCH_MODE", "greedy")
+# How many of the nearest idle ambulances get a real route request
+DISPATCH_CANDIDATES = int(os.getenv("DISPATCH_CANDIDATES", "3"))
+# Shared budget for those requests; the best ETA received by then wins
+DISPATCH_ROUTE_DEADLINE_S = float(os.getenv("DISPATCH_ROUTE_DEADLINE_S", "3"))
+# Idle units ranked by the travel-time matrix, when one has been built
+DISPATCH_MATRIX_POOL = int(os.getenv("DISPATCH_MATRIX_POOL", "10"))
+# Rank candidates (and batch costs) with one live route-matrix request
+DISPATCH_ROUTE_MATRIX = os.getenv("DISPATCH_ROUTE_MATRIX", "false").lower() == "true"
+# Fresh candidate rounds to try when every routed candidate was claimed first
+DISPATCH_CLAIM_ROUNDS = 3
+
+
+async def _route(
+    ambulances: list[Ambulance], event: Event
+) -> list[tuple[int, str, Ambulance]]:
+    """(eta, path, ambulance) for each routable ambulance, fastest first.
+
+    Routes are requested concurrently; those still pending at the deadline
+    are cancelled and left out.
     """
-    Find the nearest idle ambulance, compute ETA and path, and
-    atomically mark it as ENROUTE with ETA and timestamp.
+    if not ambulances:
+        return []
+
+    routes = {
+        asyncio.create_task(
+            compute_route_eta_and_path(amb.lat, amb.lng, event.lat, event.lng)
+        ): amb
+        for amb in ambulances
+    }
+    done, pending = await asyncio.wait(routes, timeout=DISPATCH_ROUTE_DEADLINE_S)
+    for task in pending:
+        task.cancel()
+    if pending:
+        print(f"Route deadline passed with {len(pending)} of {len(routes)} pending")
+
+    candidates = []
+    for task in done:
+        ambulance = routes[task]
+        try:
+            eta, path = task.result()
+        except Exception as e:
+            print(f"Error computing route for ambulance {ambulance.id}: {e}")
+            continue
+        if eta is not None and path:
+            candidates.append(
+                (eta, encode_path(simplify_path(path)), ambulance)
+            )
+    candidates.sort(key=lambda candidate: candidate[0])
+    return candidates
+
+
+def _rank_by_matrix(
+    nearest: list[tuple[float, Ambulance]], event: Event
+) -> list[Ambulance]:
+    """Order candidates by precomputed road ETA; unknown ETAs go last by distance."""
+
+    def key(candidate: tuple[float, Ambulance]):
+        distance, amb = candidate
+        eta = travel_matrix.eta(amb.lat, amb.lng, event.lat, event.lng)
+        return (eta is None, distance if eta is None else eta)
+
+    return [amb for _, amb in sorted(nearest, key=key)]
+
+
+async def _rank_by_route_matrix(
+    nearest: list[tuple[float, Ambulance]], event: Event
+) -> list[Ambulance]:
+    """Order candidates by live road ETA from a single matrix request.
+
+    The request gets the dispatch route deadline; past it, or on error, the
+    candidates keep their distance order.
     """
-    event = await Event.get(event_id)
+    try:
+        durations = (
+            await asyncio.wait_for(
+                compute_route_matrix(
+                    [(amb.lat, amb.lng) for _, amb in nearest], [(event.lat, event.lng)]
+                ),
+                timeout=DISPATCH_ROUTE_DEADLINE_S,
+            )
+        )[:, 0]
+    except Exception as e:
+        print(f"Route matrix for event {event.id} failed, ranking by distance: {e!r}")
+        return [amb for _, amb in nearest]
+    # Routable units by ETA first, then any the matrix could not route by distance
+    routable = [i for i in range(len(nearest)) if not np.isnan(durations[i])]
+    unroutable = [i for i in range(len(nearest)) if np.isnan(durations[i])]
+    order = sorted(routable, key=lambda i: durations[i]) + unroutable
+    return [nearest[i][1] for i in order]
 
-    if not event:
-        print(f"Event {event_id} not found.")
-        return None, None, None
-    event_lat = event.lat
-    event_lng = event.lng
 
-    ambulances = await Ambulance.find({"status": AmbulanceStatus.IDLE}).to_list()
-    print(ambulances)
-    if not ambulances:
-        print("No idle ambulances found.")
-        return None, None, None
+async def _route_candidates(event: Event) -> list[tuple[int, str, Ambulance]]:
+    """Routed candidates for the event, fastest first.
 
-    best_ambulance = None
-    best_eta = float("inf")
-    best_path = None
+    With a travel-time matrix (or DISPATCH_ROUTE_MATRIX), a wider pool is
+    ranked by road ETA and only the favourite is routed live (the runners-up
+    only if that fails). Otherwise the DISPATCH_CANDIDATES nearest are all
+    routed.
+    """
+    if travel_matrix is None and not DISPATCH_ROUTE_MATRIX:
+        nearest = fleet.nearest_idle(event.lat, event.lng, k=DISPATCH_CANDIDATES)
+        return await _route([amb for _, amb in nearest], event)
 
-    min = float("inf")
+    pool = fleet.nearest_idle(event.lat, event.lng, k=DISPATCH_MATRIX_POOL)
+    if travel_matrix is not None:
+        ranked = _rank_by_matrix(pool, event)
+    else:
+        ranked = await _rank_by_route_matrix(pool, event)
+    return await _route(ranked[:1], event) or await _route(
+        ranked[1:DISPATCH_CANDIDATES], event
+    )
+
+
+async def _dispatch_greedy(event: Event):
+    """
+    Claim the fastest of the nearest idle ambulances for a single event. The
+    claim is a compare-and-set on IDLE, so concurrent dispatches never get
+    the same ambulance; on conflict the next candidate is tried.
+    """
+    for _ in range(DISPATCH_CLAIM_ROUNDS):
+        candidates = await _route_candidates(event)
+        if not candidates:
+            print("No routable idle ambulances found.")
+            return None, None, None
+
+        for eta, path, candidate in candidates:
+            ambulance = await fleet.claim(candidate.id, event.id)
+            if ambulance is not None:
+                print(
+                    f"Claimed ambulance {ambulance.id} with ETA {eta}s "
+                    f"for event {event.id}"
+                )
+                return ambulance, eta, path
+            print(f"Ambulance {candidate.id} was claimed by another dispatch")
 
-    # Find closes ambulace
-    for amb in ambulances:
-        distance = calculate_distance(event_lat, event_lng, amb.lat, amb.lng)
-        if distance < min:
-            min = distance
-            best_ambulance = amb
+    print(f"Could not claim an ambulance for event {event.id}")
+    return None, None, None
 
-    print(f"Closest ambulance is {best_ambulance.id} at distance {min} km")
 
-    # Run API to find ETA and path for the closest ambulance
+async def _route_and_claim(event: Event, ambulance: Ambulance):
+    """
+    Route and claim one assigned pair; any failure leaves the event for the
+    greedy fallback instead of failing the rest of its batch.
+    """
     try:
-        eta, path = await compute_route_eta_and_path(
-            best_ambulance.lat, best_ambulance.lng, event_lat, event_lng
+        eta, path = await asyncio.wait_for(
+            compute_route_eta_and_path(ambulance.lat, ambulance.lng, event.lat, event.lng),
+            timeout=DISPATCH_ROUTE_DEADLINE_S,
         )
-        if eta is not None and eta < best_eta:
-            best_eta = eta
-            best_path = [Point(lat=pt[0], lng=pt[1]) for pt in path]
+        if eta is None or not path:
+            return None, None, None
+        # claim() undoes its in-memory change itself if the write fails
+        if await fleet.claim(ambulance.id, event.id) is None:
+            return None, None, None
+    except asyncio.TimeoutError:
+        return None, None, None
     except Exception as e:
-        print(f"Error computing route for best ambulance {best_ambulance.id}: {e}")
+        print(f"Batch dispatch of {ambulance.id} to event {event.id} failed: {e}")
         return None, None, None
+    return ambulance, eta, encode_path(simplify_path(path))
+
+
+async def _batch_route_costs(
+    events: list[Event], idle: list[Ambulance], distances: np.ndarray
+) -> np.ndarray:
+    """Road ETAs for the batch, with straight-line estimates where unknown.
+
+    Only the DISPATCH_MATRIX_POOL nearest units of each event are routed, so
+    the matrix stays small however large the fleet is; the request gets the
+    dispatch route deadline.
+    """
+    cost = distances * STRAIGHT_DETOUR / STRAIGHT_SPEED_KMH * 3600
+    pool = min(DISPATCH_MATRIX_POOL, len(idle))
+    columns = np.unique(np.argpartition(distances, pool - 1, axis=1)[:, :pool])
+    try:
+        durations = await asyncio.wait_for(
+            compute_route_matrix(
+                [(idle[col].lat, idle[col].lng) for col in columns],
+                [(event.lat, event.lng) for event in events],
+            ),
+            timeout=DISPATCH_ROUTE_DEADLINE_S,
+        )
+    except Exception as e:
+        print(f"Batch route matrix failed, assigning by distance: {e!r}")
+        return cost
+    routed = cost[:, columns]
+    cost[:, columns] = np.where(np.isnan(durations.T), routed, durations.T)
+    return cost
+
+
+async def _dispatch_batch(events: list[Event]):
+    """
+    Assign a burst of events to idle ambulances at minimum total distance
+    (Hungarian method over the vectorized event x idle-ambulance matrix), or
+    at minimum total road ETA with DISPATCH_ROUTE_MATRIX. Events left without
+    a unit, or whose assigned unit could not be routed or claimed, fall back
+    to greedy dispatch.
+    """
+    results = [(None, None, None)] * len(events)
+    distances, idle = fleet.idle_distances(
+        [event.lat for event in events], [event.lng for event in events]
+    )
+    if idle:
+        cost = distances
+        if DISPATCH_ROUTE_MATRIX:
+            cost = await _batch_route_costs(events, idle, distances)
+        rows, cols = solve_assignment(cost)
+        print(f"Batch dispatch: {len(rows)} of {len(events)} events matched")
+        assigned = await asyncio.gather(
+            *(_route_and_claim(events[row], idle[col]) for row, col in zip(rows, cols))
+        )
+        for row, result in zip(rows, assigned):
+            results[row] = result
+
+    for i, event in enumerate(events):
+        if results[i][0] is None:
+            try:
+                results[i] = await _dispatch_greedy(event)
+            except Exception as e:
+                print(f"Dispatch of event {event.id} failed: {e}")
+    return results
+
+
+batcher = DispatchBatcher(_dispatch_batch)
 
-    if best_ambulance is None:
+
+async def get_ambulance_and_path(event_id: PydanticObjectId):
+    """
+    Pick, claim and route an idle ambulance for the event, either on its own
+    or as part of a batch depending on DISPATCH_MODE.
+    """
+    event = await Event.get(event_id)
+
+    if not event:
+        print(f"Event {event_id} not found.")
         return None, None, None
 
-    best_ambulance = await Ambulance.get(best_ambulance.id)
-    return best_ambulance, best_eta, best_path
+    if DISPATCH_MODE == "batch":
+        return await batcher.submit(event)
+    return await _dispatch_greedy(event)
+
+
+async def dispatch_event(event: Event) -> Ambulance | None:
+    """
+    Assign an ambulance to the event and record the assignment on both
+    documents. Events that get no ambulance wait in the dispatch queue; if
+    units were idle but none could be routed, the queue retries them.
+    """
+    ambulance, eta, path = await get_ambulance_and_path(event.id)
+    if ambulance is None:
+        print(f"Event {event.id} queued until an ambulance is idle")
+        dispatch_queue.push(event)
+        if fleet.has_idle():
+            dispatch_queue.schedule_retry()
+        return None
+
+    ambulance.path = path
+    ambulance.path_index = 0
+    ambulance.eta_seconds = eta
+    await fleet.update(ambulance)
+
+    event.ambulance_id = ambulance.id
+    event.status = EventStatus.ENROUTE
+    event.dispatched_at = datetime.utcnow()
+    await event.save()
+    await broadcast_upsert("events", event)
+    return ambulance
+
+
+dispatch_queue = DispatchQueue(dispatch_event)
 
 
 async def main():
     await init_db()
+    await fleet.start()
     # Example coordinates
     events = await Event.find_all().to_list()
 
@@ -95,7 +312,7 @@ async def main():
 
     if nearest_ambulance:
         print(f"Nearest ambulance: {nearest_ambulance.id}, ETA: {eta} seconds")
-        print(f"Path is available with {len(path)} points.")
+        print(f"Path is available with {len(decode_path(path))} points.")
     else:
         print("No ambulance could be selected.")
 
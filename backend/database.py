@@ -35,6 +35,7 @@ async def init_db():
 
         from models import Camera, Event, Ambulance, Hospital
 
+        # Also creates any missing indexes declared in each model's Settings
         await init_beanie(
             database=client[MONGODB_DATABASE_NAME],
             document_models=[Camera, Event, Ambulance, Hospital],
@@ -5,9 +5,13 @@ import uvicorn
 import logging
 import asyncio
 
+from choose_ambulance import dispatch_queue
 from database import init_db
+from maps_call import close_client, start_client
 from seed_data import seed_data
 from routes import api_router
+from utils.fleet_state import fleet
+from utils.live_ws import add_remote_listener, bus, manager
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,8 +24,18 @@ async def lifespan(_app: FastAPI):
     # Startup
     logger.info("🚀 Starting Lifeline...")
     await init_db()
+    await start_client()
+    await fleet.start()
+    # Other workers' ambulance changes reach this worker's fleet via the bus
+    add_remote_listener("ambulances", fleet.apply_remote)
+    await dispatch_queue.start()
+    await manager.prime()
+    await bus.start()
     yield
     logger.info("👋 Shutting down...")
+    await bus.close()
+    await fleet.stop()
+    await close_client()
 
 
 app = FastAPI(lifespan=lifespan)
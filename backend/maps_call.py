@@ -1,14 +1,51 @@
+import asyncio
+import logging
 import os
 from datetime import datetime
 from dotenv import load_dotenv
 import httpx
+import numpy as np
 import polyline  # pip install polyline
 
+from utils.geo import estimate_travel_seconds, straight_line_route
+from utils.road_router import get_road_router
+from utils.route_cache import route_cache
+from utils.route_guard import CircuitBreaker, SingleFlight, TokenBucket
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
 
-URL = "https://routes.googleapis.com/directions/v2:computeRoutes"
+# "remote" calls the Routes API; "local" routes on the road graph in ROAD_GRAPH_PATH
+ROUTING_BACKEND = os.getenv("ROUTING_BACKEND", "remote")
+
+URL = os.getenv(
+    "ROUTES_API_URL", "https://routes.googleapis.com/directions/v2:computeRoutes"
+)
+MATRIX_URL = os.getenv(
+    "ROUTES_MATRIX_URL",
+    "https://routes.googleapis.com/distanceMatrix/v2:computeRouteMatrix",
+)
+# Provider limits per matrix request (traffic-aware routing)
+ROUTES_MATRIX_MAX_ELEMENTS = int(os.getenv("ROUTES_MATRIX_MAX_ELEMENTS", "625"))
+ROUTES_MATRIX_MAX_SIDE = int(os.getenv("ROUTES_MATRIX_MAX_SIDE", "25"))
+
+# Pool settings for the shared client
+ROUTES_MAX_CONNECTIONS = int(os.getenv("ROUTES_MAX_CONNECTIONS", "20"))
+ROUTES_MAX_KEEPALIVE = int(os.getenv("ROUTES_MAX_KEEPALIVE", "10"))
+ROUTES_KEEPALIVE_EXPIRY_S = float(os.getenv("ROUTES_KEEPALIVE_EXPIRY_S", "60"))
+ROUTES_TIMEOUT_S = float(os.getenv("ROUTES_TIMEOUT_S", "10"))
+# HTTP/2 needs `h2` (in requirements.txt); without it the client falls back to HTTP/1.1
+ROUTES_HTTP2 = os.getenv("ROUTES_HTTP2", "true").lower() == "true"
+# Outbound rate limit; a call that cannot get a token in time gets an estimate
+ROUTES_RATE_PER_S = float(os.getenv("ROUTES_RATE_PER_S", "10"))
+ROUTES_RATE_BURST = int(os.getenv("ROUTES_RATE_BURST", "20"))
+ROUTES_RATE_WAIT_S = float(os.getenv("ROUTES_RATE_WAIT_S", "1"))
+# Consecutive failures that open the breaker, and how long it stays open
+ROUTES_BREAKER_FAILURES = int(os.getenv("ROUTES_BREAKER_FAILURES", "5"))
+ROUTES_BREAKER_RESET_S = float(os.getenv("ROUTES_BREAKER_RESET_S", "30"))
 
 # Updated FieldMask to include polyline and removed trailing comma
 HEADERS = {
@@ -17,19 +54,160 @@ HEADERS = {
     "X-Goog-FieldMask": "routes.duration,routes.polyline.encodedPolyline",
 }
 
+MATRIX_HEADERS = {
+    **HEADERS,
+    "X-Goog-FieldMask": "originIndex,destinationIndex,duration,condition",
+}
+
+
+_client: httpx.AsyncClient | None = None
+_in_flight = SingleFlight()
+rate_limiter = TokenBucket(ROUTES_RATE_PER_S, ROUTES_RATE_BURST)
+breaker = CircuitBreaker(ROUTES_BREAKER_FAILURES, ROUTES_BREAKER_RESET_S)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401  optional dependency
+    except ImportError:
+        return False
+    return True
+
+
+def create_client(**kwargs) -> httpx.AsyncClient:
+    http2 = ROUTES_HTTP2 and _http2_available()
+    if ROUTES_HTTP2 and not http2:
+        logger.warning("h2 is not installed; the Routes API client uses HTTP/1.1")
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=ROUTES_TIMEOUT_S,
+        limits=httpx.Limits(
+            max_connections=ROUTES_MAX_CONNECTIONS,
+            max_keepalive_connections=ROUTES_MAX_KEEPALIVE,
+            keepalive_expiry=ROUTES_KEEPALIVE_EXPIRY_S,
+        ),
+        **kwargs,
+    )
+
+
+async def start_client() -> None:
+    """Open the shared, pooled Routes API client (called from the app lifespan)."""
+    global _client
+    if _client is None:
+        _client = create_client()
+    if ROUTING_BACKEND == "local":
+        # Load and preprocess the road graph before the first dispatch
+        await asyncio.to_thread(get_road_router)
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_client() -> httpx.AsyncClient:
+    # Scripts that skip the lifespan still get a pooled client
+    global _client
+    if _client is None:
+        _client = create_client()
+    return _client
+
 
 async def compute_route_eta_and_path(
     origin_lat: float,
     origin_lng: float,
     dest_lat: float,
     dest_lng: float,
+    estimate: bool = True,
 ) -> tuple[int | None, list[tuple[float, float]] | None]:
     """
     Returns:
         eta_seconds: int or None
         path: list of (lat, lng) points from origin to destination, or None on failure
+
+    Routes come from the backend chosen by ROUTING_BACKEND; successful
+    results are served from the route cache while fresh. Remote calls for
+    the same snapped origin/destination share one request, and while the
+    provider is rate-limited or failing a straight-line estimate is returned,
+    or (None, None) with ``estimate=False``.
     """
+    cache_key = route_cache.key(origin_lat, origin_lng, dest_lat, dest_lng)
+    cached = await route_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    if ROUTING_BACKEND == "local":
+        eta_seconds, path = await asyncio.to_thread(
+            get_road_router().route, origin_lat, origin_lng, dest_lat, dest_lng
+        )
+        if eta_seconds is not None and path:
+            await route_cache.put(cache_key, eta_seconds, path)
+        return eta_seconds, path
+
+    return await _in_flight.run(
+        (cache_key, estimate),
+        lambda: _compute_guarded(
+            cache_key, origin_lat, origin_lng, dest_lat, dest_lng, estimate
+        ),
+    )
+
+
+def _provider_failure(error: Exception) -> bool:
+    """Transport errors, 5xx and 429 count against the breaker; other 4xx do not."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
+
 
+async def _compute_guarded(
+    cache_key,
+    origin_lat: float,
+    origin_lng: float,
+    dest_lat: float,
+    dest_lng: float,
+    estimate: bool,
+) -> tuple[int | None, list[tuple[float, float]] | None]:
+    fallback = (
+        straight_line_route(origin_lat, origin_lng, dest_lat, dest_lng)
+        if estimate
+        else (None, None)
+    )
+    if not breaker.allow():
+        return fallback
+    if not await rate_limiter.acquire(ROUTES_RATE_WAIT_S):
+        logger.warning("Routes API rate limit reached; no route requested")
+        breaker.release()
+        return fallback
+
+    try:
+        eta_seconds, path = await _compute_remote(
+            origin_lat, origin_lng, dest_lat, dest_lng
+        )
+    except Exception as e:
+        print(f"Error calling Routes API: {e}")
+        if _provider_failure(e):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return None, None
+    # The provider answered: no route (a river, a park) is not its failure
+    breaker.record_success()
+    if eta_seconds is None or not path:
+        return None, None
+    # Estimates are never cached, only real routes
+    await route_cache.put(cache_key, eta_seconds, path)
+    return eta_seconds, path
+
+
+async def _compute_remote(
+    origin_lat: float,
+    origin_lng: float,
+    dest_lat: float,
+    dest_lng: float,
+) -> tuple[int | None, list[tuple[float, float]] | None]:
     body = {
         "origin": {
             "location": {"latLng": {"latitude": origin_lat, "longitude": origin_lng}}
@@ -42,28 +220,118 @@ async def compute_route_eta_and_path(
         "departureTime": "2026-02-15T23:00:00Z",
     }
 
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(URL, headers=HEADERS, json=body)
-            response.raise_for_status()
-            data = response.json()
+    # Errors propagate so the caller can tell provider failures from bad requests
+    response = await get_client().post(URL, headers=HEADERS, json=body)
+    response.raise_for_status()
+    data = response.json()
 
-        routes = data.get("routes")
-        if not routes:
-            return None, None
+    routes = data.get("routes")
+    if not routes:
+        return None, None
 
-        route = routes[0]
+    route = routes[0]
 
-        # Extract ETA in seconds
-        duration_str = route.get("duration")  # e.g., "345s"
-        eta_seconds = int(duration_str.rstrip("s")) if duration_str else None
+    # Extract ETA in seconds
+    duration_str = route.get("duration")  # e.g., "345s"
+    eta_seconds = int(duration_str.rstrip("s")) if duration_str else None
 
-        # Extract path points
-        encoded_polyline = route.get("polyline", {}).get("encodedPolyline")
-        path = polyline.decode(encoded_polyline) if encoded_polyline else None
+    # Extract path points
+    encoded_polyline = route.get("polyline", {}).get("encodedPolyline")
+    path = polyline.decode(encoded_polyline) if encoded_polyline else None
 
-        return eta_seconds, path
+    return eta_seconds, path
 
+
+def _waypoint(lat: float, lng: float) -> dict:
+    return {"waypoint": {"location": {"latLng": {"latitude": lat, "longitude": lng}}}}
+
+
+async def compute_route_matrix(
+    origins: list[tuple[float, float]],
+    destinations: list[tuple[float, float]],
+) -> np.ndarray:
+    """
+    Travel times in seconds, shape (len(origins), len(destinations)); NaN
+    where no route was found. Large matrices are split into chunks within
+    the provider's limits and the chunks are requested concurrently.
+    """
+    durations = np.full((len(origins), len(destinations)), np.nan)
+    if not origins or not destinations:
+        return durations
+
+    if ROUTING_BACKEND == "local":
+        router = get_road_router()
+
+        def fill_local() -> None:
+            for i, origin in enumerate(origins):
+                for j, destination in enumerate(destinations):
+                    eta, _ = router.route(*origin, *destination)
+                    if eta is not None:
+                        durations[i, j] = eta
+
+        await asyncio.to_thread(fill_local)
+        return durations
+
+    origin_step = min(len(origins), ROUTES_MATRIX_MAX_SIDE)
+    destination_step = min(
+        len(destinations),
+        ROUTES_MATRIX_MAX_SIDE,
+        max(1, ROUTES_MATRIX_MAX_ELEMENTS // origin_step),
+    )
+    await asyncio.gather(
+        *(
+            _compute_matrix_chunk(
+                origins[i : i + origin_step],
+                destinations[j : j + destination_step],
+                durations[i : i + origin_step, j : j + destination_step],
+            )
+            for i in range(0, len(origins), origin_step)
+            for j in range(0, len(destinations), destination_step)
+        )
+    )
+    return durations
+
+
+async def _compute_matrix_chunk(
+    origins: list[tuple[float, float]],
+    destinations: list[tuple[float, float]],
+    out: np.ndarray,
+) -> None:
+    """Fill ``out`` (a view into the full matrix) with one matrix request."""
+    allowed = breaker.allow()
+    if allowed and not await rate_limiter.acquire(ROUTES_RATE_WAIT_S):
+        breaker.release()
+        allowed = False
+    if not allowed:
+        for i, origin in enumerate(origins):
+            for j, destination in enumerate(destinations):
+                out[i, j] = estimate_travel_seconds(*origin, *destination)
+        return
+
+    body = {
+        "origins": [_waypoint(lat, lng) for lat, lng in origins],
+        "destinations": [_waypoint(lat, lng) for lat, lng in destinations],
+        "travelMode": "DRIVE",
+        "routingPreference": "TRAFFIC_AWARE",
+    }
+    try:
+        response = await get_client().post(MATRIX_URL, headers=MATRIX_HEADERS, json=body)
+        response.raise_for_status()
+        elements = response.json()
     except Exception as e:
-        print(f"Error calling Routes API: {e}")
-        return None, None
+        print(f"Error calling Routes API matrix: {e}")
+        if _provider_failure(e):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return
+
+    breaker.record_success()
+    for element in elements:
+        duration = element.get("duration")
+        if element.get("condition") != "ROUTE_EXISTS" or not duration:
+            continue
+        # Zero indexes are omitted from the JSON response
+        out[element.get("originIndex", 0), element.get("destinationIndex", 0)] = int(
+            duration.rstrip("s")
+        )
@@ -1,9 +1,12 @@
 from beanie import Document, PydanticObjectId
+from pydantic import field_validator
 from typing import Optional
 from datetime import datetime
 from enum import Enum
 
-from schemas import Point
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from utils.route_path import encode_path
 
 
 class Severity(str, Enum):
@@ -32,6 +35,15 @@ class Camera(Document):
     class Settings:
         name = "cameras"
         use_cache = False
+        indexes = [
+            # process_event looks cameras up by name; unnamed cameras are exempt
+            IndexModel(
+                [("name", ASCENDING)],
+                name="name_unique",
+                unique=True,
+                partialFilterExpression={"name": {"$type": "string"}},
+            ),
+        ]
 
 
 class Event(Document):
@@ -50,6 +62,13 @@ class Event(Document):
 
     class Settings:
         name = "events"
+        indexes = [
+            IndexModel(
+                [("status", ASCENDING), ("severity", ASCENDING), ("created_at", DESCENDING)],
+                name="status_severity_created_at",
+            ),
+            IndexModel([("ambulance_id", ASCENDING)], name="ambulance_id"),
+        ]
 
 
 class Ambulance(Document):
@@ -60,10 +79,21 @@ class Ambulance(Document):
     event_id: Optional[PydanticObjectId] = None
     eta_seconds: Optional[int] = None
     updated_at: datetime
-    path: list[Point] | None = None
+    # Encoded polyline of the current leg; path_index points already driven
+    path: str | None = None
+    path_index: int = 0
+
+    @field_validator("path", mode="before")
+    @classmethod
+    def _encode_point_list(cls, value):
+        # Documents written before paths were encoded hold a list of points
+        if isinstance(value, list):
+            return encode_path(value) if value else None
+        return value
 
     class Settings:
         name = "ambulances"
+        indexes = [IndexModel([("status", ASCENDING)], name="status")]
 
 
 class Hospital(Document):
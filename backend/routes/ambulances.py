@@ -1,24 +1,29 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import List
 
 from models import Ambulance
-from utils.ambulance import simulate_ambulance
+from utils.ambulance import run_simulation
+from utils.fleet_state import fleet
+from utils.response_cache import response_cache
 
 router = APIRouter(prefix="/ambulances", tags=["Ambulances"])
 
 
 @router.get("", response_model=List[Ambulance])
-async def get_ambulances():
+async def get_ambulances(request: Request):
     """Get all ambulances."""
-    ambulances = await Ambulance.find_all().to_list()
-    return ambulances
+
+    async def load():
+        return fleet.all()
+
+    return await response_cache.respond(request, "ambulances", load)
 
 
 @router.post("/{ambulance_id}/simulate")
 async def simulate_ambulance_route(ambulance_id: str):
-    ambulance = await Ambulance.get(ambulance_id)
+    ambulance = fleet.get(ambulance_id)
     if not ambulance:
         raise HTTPException(status_code=404, detail="Ambulance not found")
 
-    await simulate_ambulance(ambulance.id)
+    await run_simulation(ambulance.id)
     return {"ok": True, "ambulance_id": str(ambulance.id)}
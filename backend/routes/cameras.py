@@ -1,24 +1,26 @@
 from beanie import PydanticObjectId  # type: ignore
-from fastapi import APIRouter, HTTPException  # type: ignore
+from fastapi import APIRouter, HTTPException, Request  # type: ignore
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime, timezone
 import math
 import random
 
-from choose_ambulance import get_ambulance_and_path
-from utils.ambulance import simulate_ambulance
+from choose_ambulance import dispatch_event
+from utils.ambulance import run_simulation
 from models import Camera, Event, EventStatus, Severity, Ambulance, AmbulanceStatus
-from utils.live_ws import broadcast_all
+from utils.live_ws import broadcast_upsert
+from utils.response_cache import response_cache
 
 router = APIRouter(prefix="/cameras", tags=["Cameras"])
 
 
 @router.get("", response_model=List[Camera])
-async def get_cameras():
+async def get_cameras(request: Request):
     """Get all cameras."""
-    cameras = await Camera.find_all().to_list()
-    return cameras
+    return await response_cache.respond(
+        request, "cameras", lambda: Camera.find_all().to_list()
+    )
 
 
 class ManualEmergencyRequest(BaseModel):
@@ -53,18 +55,14 @@ async def trigger_emergency(
     )
 
     await event.insert()
-    await broadcast_all("events")
+    await broadcast_upsert("events", event)
 
     # Assign nearest idle ambulance
-    ambulance, eta, path = await get_ambulance_and_path(event.id)
+    ambulance = await dispatch_event(event)
     if ambulance:
-        ambulance.path = path
-        ambulance.eta_seconds = eta
-        ambulance.event_id = event.id
-        await ambulance.save()
-        await simulate_ambulance(ambulance.id)
+        await run_simulation(ambulance.id)
     else:
-        print("[Backend] No idle ambulances available to assign.")
+        print("[Backend] No idle ambulances available; event queued for dispatch.")
 
     print(f"[Backend] Manual emergency triggered for camera {camera_id}")
 
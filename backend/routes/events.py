@@ -1,11 +1,13 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel
 
-from models import Event, EventStatus, Ambulance, AmbulanceStatus, Camera
-from utils.live_ws import broadcast_all
-from beanie import PydanticObjectId
+from models import Event, EventStatus, AmbulanceStatus, Camera
+from utils.ambulance import cancel_simulation
+from utils.fleet_state import fleet
+from utils.live_ws import broadcast_upsert
+from utils.response_cache import response_cache
 
 router = APIRouter(prefix="/events", tags=["Events"])
 
@@ -51,21 +53,25 @@ class EventResponse(BaseModel):
 
 
 @router.get("", response_model=List[Event])
-async def get_events(status: Optional[EventStatus] = None):
+async def get_events(request: Request, status: Optional[EventStatus] = None):
     """Get all events, optionally filtered by status."""
-    if status:
-        events = await Event.find(Event.status == status).to_list()
-    else:
-        events = await Event.find_all().to_list()
 
-    # Convert Event documents to EventResponse with camera names
-    return events
+    async def load():
+        if status:
+            return await Event.find(Event.status == status).to_list()
+        return await Event.find_all().to_list()
+
+    return await response_cache.respond(request, "events", load, key=status)
 
 
 @router.post("/{event_id}/resolve")
-async def resolve_event(event_id: int):
+async def resolve_event(event_id: str):
     """Mark an event as resolved and free the assigned ambulance."""
-    event = await Event.get(event_id)
+    try:
+        event = await Event.get(event_id)
+    except ValueError:
+        # Not a valid ObjectId
+        event = None
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
@@ -74,16 +80,22 @@ async def resolve_event(event_id: int):
 
     # Free the ambulance
     if event.ambulance_id:
-        ambulance = await Ambulance.get(event.ambulance_id)
-        if ambulance:
+        ambulance = fleet.get(event.ambulance_id)
+        # Skip units that have already moved on to another event
+        if ambulance and ambulance.event_id == event.id:
+            # Stop its drive first: once it is idle it can be redispatched,
+            # and the old walker must not move or reset it afterwards
+            await cancel_simulation(ambulance.id)
             ambulance.status = AmbulanceStatus.IDLE
             ambulance.event_id = None
             ambulance.eta_seconds = None
+            ambulance.path = None
+            ambulance.path_index = 0
             ambulance.updated_at = datetime.utcnow()
-            await ambulance.save()
-            await broadcast_all("ambulances")
+            await fleet.update(ambulance)
+            await broadcast_upsert("ambulances", ambulance)
 
     await event.save()
-    await broadcast_all("events")
+    await broadcast_upsert("events", event)
 
     return {"ok": True, "event": event}
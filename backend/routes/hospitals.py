@@ -1,13 +1,15 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from typing import List
 
 from models import Hospital
+from utils.response_cache import response_cache
 
 router = APIRouter(prefix="/hospitals", tags=["Hospitals"])
 
 
 @router.get("", response_model=List[Hospital])
-async def get_hospitals():
+async def get_hospitals(request: Request):
     """Get all hospitals."""
-    hospitals = await Hospital.find_all().to_list()
-    return hospitals
+    return await response_cache.respond(
+        request, "hospitals", lambda: Hospital.find_all().to_list()
+    )
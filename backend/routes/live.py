@@ -1,21 +1,48 @@
+from typing import Literal, Optional
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, ValidationError
 
+from schemas import BoundingBox
 from utils.live_ws import manager
 
 router = APIRouter(tags=["Live"])
 
 
+class LiveSubscribeRequest(BaseModel):
+    """Client -> server message narrowing what a live socket receives."""
+
+    action: Literal["subscribe"]
+    types: Optional[list[Literal["ambulances", "events", "cameras"]]] = None
+    bbox: Optional[BoundingBox] = None
+    binary: bool = False
+
+
 @router.get("/ws/live/clients")
 async def get_live_client_count():
     return {"connections": manager.connection_count()}
 
 
 @router.websocket("/ws/live")
-async def live_updates(websocket: WebSocket):
-    await manager.connect(websocket)
+async def live_updates(
+    websocket: WebSocket,
+    since: Optional[int] = None,
+    epoch: Optional[str] = None,
+):
+    await manager.connect(websocket, since=since, epoch=epoch)
     try:
         while True:
-            await websocket.receive_text()
+            text = await websocket.receive_text()
+            try:
+                request = LiveSubscribeRequest.model_validate_json(text)
+            except ValidationError:
+                continue
+            manager.subscribe(
+                websocket,
+                types=request.types,
+                bbox=request.bbox,
+                binary=request.binary,
+            )
     except WebSocketDisconnect:
         await manager.disconnect(websocket)
     except Exception:
@@ -5,11 +5,11 @@ from datetime import datetime, timezone
 import math
 import random
 
-from choose_ambulance import get_ambulance_and_path
-from utils.ambulance import simulate_ambulance
+from choose_ambulance import dispatch_event
+from utils.ambulance import run_simulation
 
 from models import Event, EventStatus, Severity, Camera, Ambulance, AmbulanceStatus
-from utils.live_ws import broadcast_all
+from utils.live_ws import broadcast_upsert
 
 router = APIRouter(tags=["Process Event"])
 
@@ -68,7 +68,7 @@ async def process_event(request: ProcessEventRequest):
     #         name=request.camera_id,
     #     )
     #     await camera.insert()
-    #     await broadcast_all("cameras")
+    #     await broadcast_upsert("cameras", camera)
     #     print(f"[Backend] Created new camera: {camera.id} ({camera.name}) on port {port}")
     # else:
     #     # Update existing camera's frame URL if it doesn't match the correct port
@@ -77,7 +77,7 @@ async def process_event(request: ProcessEventRequest):
     #         print(f"[Backend] Updating camera {camera.name} frame URL from {camera.latest_frame_url} to {expected_url}")
     #         camera.latest_frame_url = expected_url
     #         await camera.save()
-    #         await broadcast_all("cameras")
+    #         await broadcast_upsert("cameras", camera)
     #     print(f"[Backend] Found existing camera: {camera.id} ({camera.name}) on port {port}")
 
     # Add small jitter to event location (mock variation from camera)
@@ -97,17 +97,13 @@ async def process_event(request: ProcessEventRequest):
         created_at=datetime.now(timezone.utc),
     )
     await event.insert()
-    await broadcast_all("events")
+    await broadcast_upsert("events", event)
     print(f"[Backend] Created event: {event.id} - {event.title} ({event.severity})")
 
     # If emergency, assign nearest idle ambulance
     if request.severity == Severity.EMERGENCY:
-        ambulance, eta, path = await get_ambulance_and_path(event.id)
+        ambulance = await dispatch_event(event)
         if ambulance:
-            ambulance.path = path
-            ambulance.eta_seconds = eta
-            ambulance.event_id = event.id
-            await ambulance.save()
-            await simulate_ambulance(ambulance.id)
+            await run_simulation(ambulance.id)
 
     return {"ok": True, "event": event}
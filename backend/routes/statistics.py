@@ -4,10 +4,15 @@ from datetime import datetime, timezone
 from pydantic import BaseModel
 import logging
 
-from models import Event, EventStatus, Severity, Ambulance, AmbulanceStatus
+from models import Event, EventStatus, Severity, Ambulance, AmbulanceStatus, Camera
+from utils.fleet_state import fleet
+from utils.route_cache import route_cache
 
 logger = logging.getLogger(__name__)
 
+# A camera counts as covered when an idle ambulance is within this distance
+COVERAGE_RADIUS_KM = 2.0
+
 router = APIRouter(prefix="/statistics", tags=["Statistics"])
 
 
@@ -24,6 +29,12 @@ class FleetOverviewItem(BaseModel):
     events_handled: int
 
 
+class CoverageStats(BaseModel):
+    radius_km: float
+    cameras_total: int
+    cameras_covered: int
+
+
 class StatisticsResponse(BaseModel):
     total_events: int
     events_resolved: int
@@ -32,6 +43,7 @@ class StatisticsResponse(BaseModel):
     active_emergencies: int
     severity_breakdown: SeverityBreakdown
     fleet_overview: List[FleetOverviewItem]
+    coverage: CoverageStats
 
 
 def map_ambulance_status(ambulance: Ambulance) -> str:
@@ -46,6 +58,23 @@ def map_ambulance_status(ambulance: Ambulance) -> str:
         return "free"  # Default fallback
 
 
+def compute_coverage(cameras: List[Camera]) -> CoverageStats:
+    """Count cameras with an idle ambulance within COVERAGE_RADIUS_KM."""
+    covered = 0
+    if cameras:
+        # One vectorized (cameras x idle ambulances) distance matrix
+        distances, idle = fleet.idle_distances(
+            [camera.lat for camera in cameras], [camera.lng for camera in cameras]
+        )
+        if idle:
+            covered = int((distances.min(axis=1) <= COVERAGE_RADIUS_KM).sum())
+    return CoverageStats(
+        radius_km=COVERAGE_RADIUS_KM,
+        cameras_total=len(cameras),
+        cameras_covered=covered,
+    )
+
+
 def ensure_timezone_aware(dt: datetime) -> datetime:
     """Ensure datetime is timezone-aware (UTC)."""
     if dt.tzinfo is None:
@@ -61,7 +90,7 @@ async def get_statistics():
         all_events = await Event.find_all().to_list()
         
         # Get all ambulances
-        all_ambulances = await Ambulance.find_all().to_list()
+        all_ambulances = fleet.all()
         
         # Calculate real statistics
         total_events = len(all_events)
@@ -251,7 +280,14 @@ async def get_statistics():
             active_emergencies=fake_active_emergencies,
             severity_breakdown=severity_breakdown,
             fleet_overview=fleet_overview,
+            coverage=compute_coverage(await Camera.find_all().to_list()),
         )
     except Exception as e:
         logger.error(f"Error in statistics endpoint: {e}", exc_info=True)
         raise
+
+
+@router.get("/route-cache")
+async def get_route_cache_statistics():
+    """Hit, miss, eviction and expiry counters of the Routes API cache."""
+    return route_cache.stats()
@@ -4,3 +4,13 @@ from pydantic import BaseModel
 class Point(BaseModel):
     lat: float
     lng: float
+
+
+class BoundingBox(BaseModel):
+    south: float
+    west: float
+    north: float
+    east: float
+
+    def contains(self, lat: float, lng: float) -> bool:
+        return self.south <= lat <= self.north and self.west <= lng <= self.east
@@ -25,6 +25,61 @@ MONGODB_CONNECTION_STRING = os.getenv(
 )
 MONGODB_DATABASE_NAME = os.getenv("MONGODB_DATABASE_NAME", "lifeline")
 
+# 🔹 Seed locations (also used by the travel-time matrix build)
+BASE_LAT = 40.44089893147938
+BASE_LNG = -79.94277710160165
+
+CAMERAS_DATA = [
+    {
+        "lat": BASE_LAT + 0.0000,
+        "lng": BASE_LNG + -0.0000,
+        "url": "http://localhost:5055",
+        "name": "CAM_12",  # Camera 1 - port 5055
+    },
+    {
+        "lat": BASE_LAT + 0.0035,
+        "lng": BASE_LNG + 0.0027,
+        "url": "http://localhost:5056",
+        "name": "Astra-12",  # Camera 2 - port 5056 (matches start-all.ts)
+    },
+    {
+        "lat": BASE_LAT + -0.0034,
+        "lng": BASE_LNG + 0.0035,
+        "url": "http://localhost:5057",
+        "name": "Astra-18",  # Camera 3 - port 5057 (Astra cameras use hyphens)
+    },
+]
+
+HOSPITALS_DATA = [
+    {
+        "name": "UPMC Presbyterian",
+        "lat": BASE_LAT + 0.0015,
+        "lng": BASE_LNG + 0.0357,
+    },
+    {
+        "name": "UPMC Mercy",
+        "lat": BASE_LAT + -0.0062,
+        "lng": BASE_LNG + 0.0104,
+    },
+    {
+        "name": "Allegheny General Hospital",
+        "lat": BASE_LAT + 0.0180,
+        "lng": BASE_LNG + -0.0074,
+    },
+]
+
+# One ambulance stationed at each hospital
+AMBULANCES_DATA = [
+    {
+        "name": name,
+        "lat": hospital["lat"] + 0.0010,
+        "lng": hospital["lng"] + 0.0010,
+    }
+    for name, hospital in zip(
+        ["Presbyterian 1", "Mercy 12", "Allegheny 42"], HOSPITALS_DATA
+    )
+]
+
 logger = logging.getLogger(__name__)
 
 
@@ -52,53 +107,11 @@ async def seed_data():
     logger.info("✅ Collections dropped, seeding data...")
 
     # 🔹 Seed cameras (3 cameras for Overshoot integration)
-    base_lat = 40.44089893147938
-    base_lng = -79.94277710160165
-
-    cameras_data = [
-        {
-            "lat": base_lat + 0.0000,
-            "lng": base_lng + -0.0000,
-            "url": "http://localhost:5055",
-            "name": "CAM_12",  # Camera 1 - port 5055
-        },
-        {
-            "lat": base_lat + 0.0035,
-            "lng": base_lng + 0.0027,
-            "url": "http://localhost:5056",
-            "name": "Astra-12",  # Camera 2 - port 5056 (matches start-all.ts)
-        },
-        {
-            "lat": base_lat + -0.0034,
-            "lng": base_lng + 0.0035,
-            "url": "http://localhost:5057",
-            "name": "Astra-18",  # Camera 3 - port 5057 (Astra cameras use hyphens)
-        },
-    ]
-
-    cameras = [Camera(**cam) for cam in cameras_data]
+    cameras = [Camera(**cam) for cam in CAMERAS_DATA]
     await Camera.insert_many(cameras)
 
     # 🔹 Seed hospitals
-    hospitals_data = [
-        {
-            "name": "UPMC Presbyterian",
-            "lat": base_lat + 0.0015,
-            "lng": base_lng + 0.0357,
-        },
-        {
-            "name": "UPMC Mercy",
-            "lat": base_lat + -0.0062,
-            "lng": base_lng + 0.0104,
-        },
-        {
-            "name": "Allegheny General Hospital",
-            "lat": base_lat + 0.0180,
-            "lng": base_lng + -0.0074,
-        },
-    ]
-
-    hospitals = [Hospital(**hosp) for hosp in hospitals_data]
+    hospitals = [Hospital(**hosp) for hosp in HOSPITALS_DATA]
     await Hospital.insert_many(hospitals)
 
     now = datetime.utcnow()
@@ -215,32 +228,17 @@ async def seed_data():
     # 🔹 Seed ambulances (one per hospital)
     ambulances = [
         Ambulance(
-            lat=hospitals_data[0]["lat"] + 0.0010,
-            lng=hospitals_data[0]["lng"] + 0.0010,
-            name="Presbyterian 1",
+            **amb,
             status=AmbulanceStatus.IDLE,
             updated_at=datetime.utcnow(),
-        ),
-        Ambulance(
-            lat=hospitals_data[1]["lat"] + 0.0010,
-            lng=hospitals_data[1]["lng"] + 0.0010,
-            name="Mercy 12",
-            status=AmbulanceStatus.IDLE,
-            updated_at=datetime.utcnow(),
-        ),
-        Ambulance(
-            lat=hospitals_data[2]["lat"] + 0.0010,
-            lng=hospitals_data[2]["lng"] + 0.0010,
-            name="Allegheny 42",
-            status=AmbulanceStatus.IDLE,
-            updated_at=datetime.utcnow(),
-        ),
+        )
+        for amb in AMBULANCES_DATA
     ]
     await Ambulance.insert_many(ambulances)
 
     logger.info(
-        f"✅ Seeded {len(cameras_data)} cameras, {len(hospitals_data)} hospitals, "
-        f"and {len(hospitals_data)} ambulances"
+        f"✅ Seeded {len(CAMERAS_DATA)} cameras, {len(HOSPITALS_DATA)} hospitals, "
+        f"and {len(AMBULANCES_DATA)} ambulances"
     )
 
 
@@ -0,0 +1,130 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from beanie import PydanticObjectId
+
+import choose_ambulance
+from models import Ambulance, AmbulanceStatus
+from utils.fleet_state import FleetState
+
+
+def ambulance(lat: float) -> Ambulance:
+    # model_construct skips Beanie's collection check; no database is needed
+    return Ambulance.model_construct(
+        id=PydanticObjectId(),
+        lat=lat,
+        lng=-79.99,
+        name=f"Ambulance {lat}",
+        status=AmbulanceStatus.IDLE,
+        event_id=None,
+        eta_seconds=None,
+        updated_at=datetime.utcnow(),
+        path=None,
+        path_index=0,
+    )
+
+
+class FakeCollection:
+    """Stored status per ambulance with a conditional ``update_one``."""
+
+    def __init__(self, ambulances: list[Ambulance]) -> None:
+        self.docs = {amb.id: amb.model_copy() for amb in ambulances}
+        self.claims: list[tuple[PydanticObjectId, PydanticObjectId]] = []
+
+    async def update_one(self, query: dict, update: dict):
+        # Let concurrent claims interleave at the write, as they would over the network
+        await asyncio.sleep(0)
+        doc = self.docs[query["_id"]]
+        if doc.status.value != query["status"]:
+            return SimpleNamespace(matched_count=0)
+        doc.status = AmbulanceStatus(update["$set"]["status"])
+        doc.event_id = update["$set"]["event_id"]
+        self.claims.append((doc.id, doc.event_id))
+        return SimpleNamespace(matched_count=1)
+
+    async def get(self, ambulance_id):
+        return self.docs[ambulance_id].model_copy()
+
+
+def _async(value):
+    async def call():
+        return list(value)
+
+    return call
+
+
+@pytest.fixture
+def fleet(monkeypatch):
+    """A FleetState over three idle units, backed by a FakeCollection."""
+    ambulances = [ambulance(40.40), ambulance(40.41), ambulance(40.42)]
+    collection = FakeCollection(ambulances)
+    monkeypatch.setattr(Ambulance, "find_all", lambda: SimpleNamespace(to_list=_async(ambulances)))
+    monkeypatch.setattr(Ambulance, "get_pymongo_collection", lambda: collection)
+    monkeypatch.setattr(Ambulance, "get", collection.get)
+
+    async def route(origin_lat, origin_lng, dest_lat, dest_lng):
+        # Nearer units are faster, so candidates are tried in a known order
+        return 60 + round(abs(dest_lat - origin_lat) * 1e5), [(origin_lat, origin_lng), (dest_lat, dest_lng)]
+
+    state = FleetState()
+    monkeypatch.setattr(choose_ambulance, "fleet", state)
+    monkeypatch.setattr(choose_ambulance, "compute_route_eta_and_path", route)
+    monkeypatch.setattr(choose_ambulance, "DISPATCH_CANDIDATES", 3)
+    asyncio.run(state.load())
+    return state, collection, ambulances
+
+
+def event(lat: float = 40.40) -> SimpleNamespace:
+    return SimpleNamespace(id=PydanticObjectId(), lat=lat, lng=-79.99)
+
+
+def test_lost_claim_adopts_stored_state_and_tries_next_candidate(fleet):
+    state, collection, (nearest, second, _) = fleet
+    # Another worker claimed the nearest unit; this worker's copy is stale
+    other_event = PydanticObjectId()
+    collection.docs[nearest.id].status = AmbulanceStatus.ENROUTE
+    collection.docs[nearest.id].event_id = other_event
+
+    emergency = event()
+    claimed, eta, path = asyncio.run(choose_ambulance._dispatch_greedy(emergency))
+
+    assert claimed.id == second.id and eta == 1060 and path
+    assert collection.claims == [(second.id, emergency.id)]
+    adopted = state.get(nearest.id)
+    assert adopted.status == AmbulanceStatus.ENROUTE
+    assert adopted.event_id == other_event
+    assert nearest.id not in [amb.id for _, amb in state.nearest_idle(40.40, -79.99, k=3)]
+
+
+def test_failed_claim_write_reverts_memory(fleet, monkeypatch):
+    state, collection, (nearest, _, _) = fleet
+
+    async def broken(query, update):
+        raise ConnectionError("write failed")
+
+    monkeypatch.setattr(collection, "update_one", broken)
+    with pytest.raises(ConnectionError):
+        asyncio.run(state.claim(nearest.id, PydanticObjectId()))
+
+    assert state.get(nearest.id).status == AmbulanceStatus.IDLE
+    assert state.get(nearest.id).event_id is None
+    assert nearest.id in [amb.id for _, amb in state.nearest_idle(40.40, -79.99, k=3)]
+
+
+def test_concurrent_dispatches_never_share_an_ambulance(fleet):
+    state, collection, ambulances = fleet
+
+    async def dispatch_all():
+        # Four emergencies at the same spot compete for three units
+        return await asyncio.gather(
+            *(choose_ambulance._dispatch_greedy(event()) for _ in range(4))
+        )
+
+    results = asyncio.run(dispatch_all())
+    claimed = [amb.id for amb, _, _ in results if amb is not None]
+
+    assert sorted(claimed) == sorted(amb.id for amb in ambulances)
+    assert len(collection.claims) == 3
+    assert not state.has_idle()
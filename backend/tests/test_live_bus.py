@@ -0,0 +1,90 @@
+import asyncio
+
+import orjson
+
+from utils.live_bus import SocketBus, start_broker
+from utils.live_ws import LiveConnectionManager
+
+UPSERT = {"type": "events", "op": "upsert", "data": [{"_id": "e1", "lat": 1.0, "lng": 2.0}]}
+
+
+class FakeWebSocket:
+    def __init__(self) -> None:
+        self.messages: list[dict] = []
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, text: str) -> None:
+        self.messages.append(orjson.loads(text))
+
+    async def send_bytes(self, data: bytes) -> None:
+        pass
+
+
+async def wait_for(condition, timeout: float = 5.0) -> None:
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+def upserts(websocket: FakeWebSocket) -> list[dict]:
+    return [m for m in websocket.messages if m.get("op") == "upsert"]
+
+
+async def connect_worker(port: int) -> tuple[SocketBus, FakeWebSocket]:
+    manager = LiveConnectionManager()
+    websocket = FakeWebSocket()
+    await manager.connect(websocket)
+    bus = SocketBus(manager.broadcast, "127.0.0.1", port)
+    await bus.start()
+    await asyncio.wait_for(bus.connected.wait(), 5)
+    return bus, websocket
+
+
+def test_two_workers_round_trip_through_broker():
+    async def scenario():
+        server = await start_broker("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        (bus_a, socket_a), (bus_b, socket_b) = [await connect_worker(port) for _ in range(2)]
+
+        bus_a.publish(UPSERT)
+        await wait_for(lambda: upserts(socket_a) and upserts(socket_b))
+        for websocket in (socket_a, socket_b):
+            assert upserts(websocket)[0]["data"] == UPSERT["data"]
+
+        await bus_a.close()
+        await bus_b.close()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(scenario())
+
+
+def test_socket_bus_reconnects_after_broker_restart(monkeypatch):
+    monkeypatch.setattr("utils.live_bus.LIVE_BUS_RETRY_MIN_S", 0.05)
+
+    async def scenario():
+        server = await start_broker("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        bus, websocket = await connect_worker(port)
+
+        server.close()
+        await server.wait_closed()
+        # Closing the listener leaves accepted connections open; drop them too
+        bus._writer.close()
+        await wait_for(lambda: not bus.connected.is_set())
+
+        # Published while the broker is down: queued and sent after reconnect
+        bus.publish(UPSERT)
+        server = await start_broker("127.0.0.1", port)
+        await asyncio.wait_for(bus.connected.wait(), 5)
+        await wait_for(lambda: upserts(websocket))
+
+        await bus.close()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(scenario())
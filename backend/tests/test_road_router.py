@@ -0,0 +1,81 @@
+import csv
+import random
+
+import pytest
+
+from utils.road_router import RoadRouter
+
+SPACING_DEG = 0.001
+ORIGIN_LAT, ORIGIN_LNG = 40.40, -79.99
+
+
+def grid(size: int, rng: random.Random) -> tuple[list[tuple[float, float]], list]:
+    """A size x size street grid with random travel times and some one-way edges."""
+    coords = [
+        (ORIGIN_LAT + i * SPACING_DEG, ORIGIN_LNG + j * SPACING_DEG)
+        for i in range(size)
+        for j in range(size)
+    ]
+    edges = []
+    for i in range(size):
+        for j in range(size):
+            for di, dj in ((1, 0), (0, 1)):
+                if i + di < size and j + dj < size:
+                    a, b = i * size + j, (i + di) * size + j + dj
+                    seconds = rng.uniform(6, 20)
+                    edges.append((a, b, seconds))
+                    if rng.random() >= 0.2:
+                        edges.append((b, a, seconds))
+    return coords, edges
+
+
+def test_alt_matches_dijkstra_on_one_way_grid():
+    coords, edges = grid(12, random.Random(5))
+    router = RoadRouter(coords, edges, landmarks=4)
+    assert router.landmarks
+
+    rng = random.Random(6)
+    for _ in range(100):
+        source, target = rng.randrange(len(coords)), rng.randrange(len(coords))
+        expected = router._dijkstra(source, router._out)[target]
+        result = router.shortest_path(source, target)
+        if expected == float("inf"):
+            assert result is None
+            continue
+        seconds, path = result
+        assert seconds == pytest.approx(expected)
+        assert path[0] == source and path[-1] == target
+        # The path only uses edges in their allowed direction and adds up
+        hops = [dict(router._out[a])[b] for a, b in zip(path, path[1:])]
+        assert sum(hops) == pytest.approx(seconds)
+
+
+def test_unreachable_target(tmp_path):
+    # a <-> b, and b -> c one way: c cannot reach a
+    graph = tmp_path / "graph.csv"
+    with open(graph, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            ["source", "source_lat", "source_lng", "target", "target_lat", "target_lng", "seconds", "oneway"]
+        )
+        writer.writerow(["a", 40.400, -79.990, "b", 40.401, -79.990, 10, 0])
+        writer.writerow(["b", 40.401, -79.990, "c", 40.402, -79.990, 10, 1])
+    router = RoadRouter.from_csv(str(graph))
+
+    assert router.route(40.400, -79.990, 40.402, -79.990)[0] == 20
+    assert router.route(40.402, -79.990, 40.400, -79.990) == (None, None)
+
+
+def test_route_shape():
+    coords, edges = grid(5, random.Random(7))
+    # Both directions everywhere, so every pair is routable
+    edges += [(b, a, seconds) for a, b, seconds in edges]
+    router = RoadRouter(coords, edges, landmarks=2)
+
+    origin, destination = (40.4001, -79.9899), (40.4039, -79.9861)
+    eta, path = router.route(*origin, *destination)
+    assert isinstance(eta, int) and eta > 0
+    assert path[0] == origin and path[-1] == destination
+    assert all(isinstance(point, tuple) and len(point) == 2 for point in path)
+    assert path[1] == coords[router.nearest_node(*origin)[1]]
+    assert path[-2] == coords[router.nearest_node(*destination)[1]]
@@ -1,16 +1,28 @@
 import asyncio
 import logging
+import math
+import os
 import random
 from datetime import datetime
 
 from beanie import PydanticObjectId
 
 from models import Ambulance, AmbulanceStatus, Event, EventStatus
-from utils.live_ws import broadcast_all
+from utils.fleet_state import fleet
+from utils.live_ws import broadcast_upsert
+from utils.geo import STRAIGHT_SPEED_KMH
+from utils.route_path import decode_path, encode_path, path_length_km, resample_path
 from schemas import Point
 
 logger = logging.getLogger(__name__)
 
+# Constant driving speed for the simulation; 0 drives each leg in the route's ETA
+SIMULATION_SPEED_KMH = float(os.getenv("SIMULATION_SPEED_KMH", "0"))
+# Simulated seconds per real second
+SIMULATION_TIME_SCALE = float(os.getenv("SIMULATION_TIME_SCALE", "1"))
+if SIMULATION_TIME_SCALE <= 0:
+    raise ValueError(f"SIMULATION_TIME_SCALE must be > 0, got {SIMULATION_TIME_SCALE}")
+
 
 def _set_location(ambulance: Ambulance, point: Point) -> None:
     if hasattr(ambulance, "location"):
@@ -20,26 +32,39 @@ def _set_location(ambulance: Ambulance, point: Point) -> None:
         ambulance.lng = point.lng
 
 
+def _leg_seconds(path: list[tuple[float, float]], eta_seconds: int | None) -> float:
+    """Simulated duration of a leg: the route's ETA, or its length at a set speed."""
+    if SIMULATION_SPEED_KMH > 0 or not eta_seconds:
+        speed_kmh = SIMULATION_SPEED_KMH or STRAIGHT_SPEED_KMH
+        return path_length_km(path) / speed_kmh * 3600
+    return eta_seconds
+
+
 async def _walk_path(
     ambulance: Ambulance,
-    path: list[Point],
+    path: list[tuple[float, float]],
     status: AmbulanceStatus,
     update_interval_ms: int,
+    duration_s: float,
 ) -> None:
-    # Initialize ETA to total number of seconds remaining
-    eta_seconds = len(path) * (update_interval_ms / 1000)
-    print("Starting ambulance walk:", ambulance.id, path, eta_seconds)
-    while path:
-        next_point = path.pop(0)
+    # The leg is encoded once; each tick only advances path_index
+    ambulance.path = encode_path(path)
+    # One evenly spaced position per tick, so ticks follow the trip time
+    tick_s = update_interval_ms / 1000 * SIMULATION_TIME_SCALE
+    ticks = max(1, math.ceil(duration_s / tick_s))
+    positions = resample_path(path, ticks)
+    print("Starting ambulance walk:", ambulance.id, len(positions), "ticks", duration_s)
+    for tick, (lat, lng, path_index) in enumerate(positions, start=1):
+        next_point = Point(lat=lat, lng=lng)
         _set_location(ambulance, next_point)
         ambulance.status = status
-        ambulance.path = path
+        ambulance.path_index = path_index
 
         # Update ETA
-        ambulance.eta_seconds = max(0, eta_seconds)
+        ambulance.eta_seconds = max(0, round(duration_s * (1 - tick / ticks)))
         print("Ambulance moving to:", next_point, "ETA:", ambulance.eta_seconds)
-        await ambulance.save()
-        await broadcast_all("ambulances")
+        await fleet.update(ambulance)
+        await broadcast_upsert("ambulances", ambulance)
 
         logger.info(
             "Ambulance %s moved to %s,%s | ETA: %.1fs",
@@ -50,7 +75,6 @@ async def _walk_path(
         )
 
         await asyncio.sleep(update_interval_ms / 1000)
-        eta_seconds -= update_interval_ms / 1000
 
 
 async def simulate_ambulance(
@@ -58,17 +82,29 @@ async def simulate_ambulance(
     update_interval_ms: int = 1000,
 ):
     """Simulate an ambulance moving along its path and returning."""
-    ambulance = await Ambulance.get(ambulance_id)
+    ambulance = fleet.get(ambulance_id)
     if not ambulance:
         raise ValueError(f"Ambulance {ambulance_id} not found")
 
     if not ambulance.path:
         return
 
-    original_path = list(ambulance.path)
+    full_path = decode_path(ambulance.path)
+    original_path = full_path[ambulance.path_index :]
+    if ambulance.path_index:
+        # Resuming mid-leg: start from where the ambulance stopped
+        original_path.insert(0, (ambulance.lat, ambulance.lng))
+    duration_s = _leg_seconds(original_path, ambulance.eta_seconds)
+    # The way back covers the whole leg at the same pace
+    remaining_km = path_length_km(original_path)
+    return_s = (
+        duration_s * path_length_km(full_path) / remaining_km
+        if remaining_km
+        else _leg_seconds(full_path, None)
+    )
 
     await _walk_path(
-        ambulance, list(original_path), AmbulanceStatus.ENROUTE, update_interval_ms
+        ambulance, original_path, AmbulanceStatus.ENROUTE, update_interval_ms, duration_s
     )
 
     if ambulance.event_id:
@@ -78,18 +114,61 @@ async def simulate_ambulance(
             event.status = EventStatus.RESOLVED
             event.resolved_at = datetime.utcnow()
             await event.save()
-            await broadcast_all("events")
+            await broadcast_upsert("events", event)
 
-    reverse_path = list(reversed(original_path))
+    # Back along the whole leg, so a resumed drive still ends at its start
+    reverse_path = list(reversed(full_path))
     await _walk_path(
-        ambulance, reverse_path, AmbulanceStatus.ENROUTE, update_interval_ms
+        ambulance,
+        reverse_path,
+        AmbulanceStatus.ENROUTE,
+        update_interval_ms,
+        return_s,
     )
 
-    ambulance.path = []
+    ambulance.path = None
+    ambulance.path_index = 0
     ambulance.status = AmbulanceStatus.IDLE
     ambulance.eta_seconds = None
-    await ambulance.save()
-    await broadcast_all("ambulances")
+    await fleet.update(ambulance)
+    await broadcast_upsert("ambulances", ambulance)
+
+
+# The one running simulation per ambulance, so a redispatch never leaves two
+# walkers moving the same (shared, in-memory) ambulance object
+_simulations: dict[PydanticObjectId, asyncio.Task] = {}
+
+
+async def cancel_simulation(ambulance_id: PydanticObjectId) -> None:
+    """Stop the ambulance's running simulation, if any, and wait for it to end."""
+    task = _simulations.pop(ambulance_id, None)
+    if task is not None and not task.done():
+        task.cancel()
+        await asyncio.wait([task])
+
+
+async def start_simulation(
+    ambulance_id: PydanticObjectId, update_interval_ms: int = 1000
+) -> asyncio.Task:
+    """Run simulate_ambulance in the background, replacing any running one."""
+    await cancel_simulation(ambulance_id)
+    task = asyncio.create_task(simulate_ambulance(ambulance_id, update_interval_ms))
+    _simulations[ambulance_id] = task
+
+    def forget(done: asyncio.Task) -> None:
+        if _simulations.get(ambulance_id) is done:
+            del _simulations[ambulance_id]
+
+    task.add_done_callback(forget)
+    return task
+
+
+async def run_simulation(ambulance_id: PydanticObjectId, update_interval_ms: int = 1000) -> None:
+    """Start the ambulance's simulation and wait until it ends or is cancelled."""
+    task = await start_simulation(ambulance_id, update_interval_ms)
+    await asyncio.wait([task])
+    if not task.cancelled() and task.exception() is not None:
+        raise task.exception()
 
 
 if __name__ == "__main__":
@@ -98,8 +177,10 @@ if __name__ == "__main__":
 
     async def main():
         await init_db()
+        await fleet.start()
         # Replace with a valid ambulance ID from your database
         ambulance_id = PydanticObjectId("696c2d67f92424a53226ff1b")
         await simulate_ambulance(ambulance_id, update_interval_ms=2000)
+        await fleet.stop()
 
     asyncio.run(main())
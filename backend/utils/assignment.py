@@ -0,0 +1,72 @@
+import numpy as np
+
+
+def solve_assignment(cost) -> tuple[list[int], list[int]]:
+    """Minimum-cost one-to-one assignment (Hungarian method, O(n^2 m)).
+
+    ``cost`` is an (n, m) matrix; min(n, m) pairs are returned as parallel
+    ``(rows, cols)`` lists sorted by row, like scipy's linear_sum_assignment.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    if n == 0:
+        return [], []
+
+    # 1-based potentials and matching as in the classic formulation;
+    # column 0 is the virtual start of each augmenting path
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=np.int64)  # column -> row (1-based, 0 = free)
+    way = np.zeros(m + 1, dtype=np.int64)
+    for row in range(1, n + 1):
+        match[0] = row
+        col = 0
+        min_slack = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[col] = True
+            current = match[col]
+            free = ~used[1:]
+            slack = cost[current - 1] - u[current] - v[1:]
+            better = free & (slack < min_slack[1:])
+            min_slack[1:][better] = slack[better]
+            way[1:][better] = col
+            candidates = np.where(free, min_slack[1:], np.inf)
+            next_col = int(candidates.argmin()) + 1
+            delta = candidates[next_col - 1]
+            u[match[used]] += delta
+            v[used] -= delta
+            min_slack[1:][free] -= delta
+            col = next_col
+            if match[col] == 0:
+                break
+        # Flip the augmenting path
+        while col:
+            previous = way[col]
+            match[col] = match[previous]
+            col = previous
+
+    pairs = sorted(
+        (int(match[col]) - 1, col - 1) for col in range(1, m + 1) if match[col]
+    )
+    if transposed:
+        pairs = sorted((col, row) for row, col in pairs)
+    return [row for row, _ in pairs], [col for _, col in pairs]
+
+
+def greedy_assignment(cost) -> tuple[list[int], list[int]]:
+    """Each row in order takes its cheapest still-free column."""
+    cost = np.asarray(cost, dtype=np.float64)
+    taken = np.zeros(cost.shape[1], dtype=bool)
+    rows, cols = [], []
+    for row in range(cost.shape[0]):
+        if taken.all():
+            break
+        col = int(np.where(taken, np.inf, cost[row]).argmin())
+        taken[col] = True
+        rows.append(row)
+        cols.append(col)
+    return rows, cols
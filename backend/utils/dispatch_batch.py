@@ -0,0 +1,60 @@
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+# How long the first emergency of a burst waits for others to join its batch
+DISPATCH_BATCH_WINDOW_MS = int(os.getenv("DISPATCH_BATCH_WINDOW_MS", "250"))
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class DispatchBatcher(Generic[T, R]):
+    """Collects items over a short window and solves them together.
+
+    ``submit`` returns once the batch containing the item has been solved;
+    ``solve`` receives the whole batch and returns one result per item.
+    """
+
+    def __init__(
+        self,
+        solve: Callable[[list[T]], Awaitable[list[R]]],
+        window_ms: int = DISPATCH_BATCH_WINDOW_MS,
+    ) -> None:
+        self._solve = solve
+        self.window = window_ms / 1000
+        self._pending: list[tuple[T, asyncio.Future]] = []
+        self._scheduled = False
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if not self._scheduled:
+            self._scheduled = True
+            loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        self._scheduled = False
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[T, asyncio.Future]]) -> None:
+        try:
+            results = await self._solve([item for item, _ in batch])
+        except Exception as e:
+            logger.error("Batch of %s failed: %s", len(batch), e)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
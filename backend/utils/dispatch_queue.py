@@ -0,0 +1,115 @@
+import asyncio
+import heapq
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from beanie import PydanticObjectId
+
+from models import Ambulance, Event, EventStatus, Severity
+from utils.ambulance import start_simulation
+from utils.fleet_state import fleet
+
+logger = logging.getLogger(__name__)
+
+# Lower is more urgent; ties are broken by age
+SEVERITY_PRIORITY = {Severity.EMERGENCY: 0, Severity.INFORMATIONAL: 1}
+# Backoff for retrying events that failed to route while units were idle
+DISPATCH_RETRY_MIN_S = float(os.getenv("DISPATCH_RETRY_MIN_S", "2"))
+DISPATCH_RETRY_MAX_S = float(os.getenv("DISPATCH_RETRY_MAX_S", "60"))
+
+
+def _utc_timestamp(moment: datetime) -> float:
+    # Mongo hands back naive datetimes that are UTC; new events are tz-aware
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+class DispatchQueue:
+    """Events waiting for an idle ambulance, most severe and then oldest first.
+
+    The heap is rebuilt on start from the events collection (open events
+    without an ambulance), so waiting events survive restarts. It is drained
+    whenever the fleet reports an ambulance turning idle. An event that
+    fails to dispatch while units are idle (route errors, the route deadline)
+    would never see that transition, so it is retried with backoff instead.
+    """
+
+    def __init__(self, dispatch: Callable[[Event], Awaitable[Ambulance | None]]) -> None:
+        self._dispatch = dispatch
+        self._heap: list[tuple[int, float, str, PydanticObjectId]] = []
+        self._queued: set[PydanticObjectId] = set()
+        self._drain_task: asyncio.Task | None = None
+        self._retry_handle: asyncio.TimerHandle | None = None
+        self._retry_delay = DISPATCH_RETRY_MIN_S
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    async def start(self) -> None:
+        await self.load()
+        fleet.add_idle_listener(self.request_drain)
+        self.request_drain()
+
+    async def load(self) -> None:
+        events = await Event.find(
+            Event.status == EventStatus.OPEN,
+            Event.severity == Severity.EMERGENCY,
+            Event.ambulance_id == None,  # noqa: E711
+        ).to_list()
+        self._heap = []
+        self._queued = set()
+        for event in events:
+            self.push(event)
+        logger.info("Loaded %s waiting events into the dispatch queue", len(events))
+
+    def push(self, event: Event) -> None:
+        if event.id in self._queued:
+            return
+        self._queued.add(event.id)
+        heapq.heappush(
+            self._heap,
+            (
+                SEVERITY_PRIORITY.get(event.severity, len(SEVERITY_PRIORITY)),
+                _utc_timestamp(event.created_at),
+                str(event.id),
+                event.id,
+            ),
+        )
+
+    def request_drain(self) -> None:
+        if self._heap and (self._drain_task is None or self._drain_task.done()):
+            self._drain_task = asyncio.create_task(self.drain())
+
+    def schedule_retry(self) -> None:
+        """Drain again after the backoff delay, unless a retry is already due."""
+        if self._retry_handle is not None or not self._heap:
+            return
+        delay = self._retry_delay
+        self._retry_delay = min(delay * 2, DISPATCH_RETRY_MAX_S)
+        self._retry_handle = asyncio.get_running_loop().call_later(delay, self._retry)
+
+    def _retry(self) -> None:
+        self._retry_handle = None
+        self.request_drain()
+
+    async def drain(self) -> None:
+        """Dispatch waiting events while there are idle ambulances."""
+        while self._heap and fleet.has_idle():
+            *_, event_id = heapq.heappop(self._heap)
+            self._queued.discard(event_id)
+            event = await Event.get(event_id)
+            # Resolved or assigned while waiting
+            if event is None or event.status != EventStatus.OPEN or event.ambulance_id:
+                continue
+            ambulance = await self._dispatch(event)
+            if ambulance is None:
+                self.push(event)
+                if fleet.has_idle():
+                    self.schedule_retry()
+                break
+            self._retry_delay = DISPATCH_RETRY_MIN_S
+            logger.info("Dispatched waiting event %s to %s", event.id, ambulance.id)
+            await start_simulation(ambulance.id)
@@ -0,0 +1,117 @@
+from typing import Hashable
+
+import numpy as np
+
+from models import AmbulanceStatus
+from utils.geo import EARTH_RADIUS_KM
+
+STATUS_CODES = {
+    AmbulanceStatus.IDLE: 0,
+    AmbulanceStatus.ENROUTE: 1,
+    AmbulanceStatus.UNAVAILABLE: 2,
+}
+
+
+def haversine_km(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """Vectorized haversine distance in km; arguments broadcast like NumPy ops."""
+    lat1, lng1, lat2, lng2 = (
+        np.radians(np.asarray(x, dtype=np.float64)) for x in (lat1, lng1, lat2, lng2)
+    )
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class FleetArrays:
+    """Columnar fleet: parallel lat, lng and status-code arrays plus ids.
+
+    Rows are kept dense (removal swaps in the last row), so the ``lat``,
+    ``lng``, ``status`` and ``ids`` views always line up index for index.
+    """
+
+    def __init__(self, capacity: int = 64) -> None:
+        self._lat = np.empty(capacity, dtype=np.float64)
+        self._lng = np.empty(capacity, dtype=np.float64)
+        self._status = np.empty(capacity, dtype=np.int8)
+        self._ids: list[Hashable] = []
+        self._rows: dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def lat(self) -> np.ndarray:
+        return self._lat[: len(self._ids)]
+
+    @property
+    def lng(self) -> np.ndarray:
+        return self._lng[: len(self._ids)]
+
+    @property
+    def status(self) -> np.ndarray:
+        return self._status[: len(self._ids)]
+
+    @property
+    def ids(self) -> list[Hashable]:
+        return self._ids
+
+    def upsert(self, key: Hashable, lat: float, lng: float, status: AmbulanceStatus) -> None:
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self._ids)
+            if row == len(self._lat):
+                self._grow()
+            self._ids.append(key)
+            self._rows[key] = row
+        self._lat[row] = lat
+        self._lng[row] = lng
+        self._status[row] = STATUS_CODES[status]
+
+    def remove(self, key: Hashable) -> None:
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        last = len(self._ids) - 1
+        if row != last:
+            moved = self._ids[last]
+            self._lat[row] = self._lat[last]
+            self._lng[row] = self._lng[last]
+            self._status[row] = self._status[last]
+            self._ids[row] = moved
+            self._rows[moved] = row
+        self._ids.pop()
+
+    def _grow(self) -> None:
+        capacity = max(2 * len(self._lat), 64)
+        for name in ("_lat", "_lng", "_status"):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def distances(self, lat, lng) -> np.ndarray:
+        """Distances (km) from one point, shape (n,), or many, shape (m, n)."""
+        lat, lng = np.asarray(lat, dtype=np.float64), np.asarray(lng, dtype=np.float64)
+        if lat.ndim == 0:
+            return haversine_km(lat, lng, self.lat, self.lng)
+        return haversine_km(lat[:, None], lng[:, None], self.lat[None, :], self.lng[None, :])
+
+    def mask(self, status: AmbulanceStatus) -> np.ndarray:
+        return self.status == STATUS_CODES[status]
+
+    def nearest(
+        self, lat: float, lng: float, k: int = 1, status: AmbulanceStatus | None = None
+    ) -> list[tuple[float, Hashable]]:
+        """Up to ``k`` (distance_km, id) pairs, closest first, optionally by status."""
+        rows = np.arange(len(self._ids))
+        if status is not None:
+            rows = rows[self.mask(status)]
+        if rows.size == 0 or k <= 0:
+            return []
+        distances = haversine_km(lat, lng, self.lat[rows], self.lng[rows])
+        k = min(k, rows.size)
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top])]
+        return [(float(distances[i]), self._ids[rows[i]]) for i in top]
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import os
+from typing import Callable
+
+import numpy as np
+
+from beanie import PydanticObjectId
+from beanie.odm.utils.dump import get_dict
+from bson.errors import InvalidId
+from pymongo import UpdateOne
+
+from models import Ambulance, AmbulanceStatus
+from utils.fleet_arrays import FleetArrays
+from utils.spatial_index import SpatialIndex
+
+logger = logging.getLogger(__name__)
+
+# How often transient position/ETA changes are written back to MongoDB
+FLEET_FLUSH_INTERVAL_S = float(os.getenv("FLEET_FLUSH_INTERVAL_S", "2"))
+
+
+class FleetState:
+    """Authoritative in-process ambulance state with write-behind persistence.
+
+    Simulation ticks only touch memory; dirty ambulances are written to MongoDB
+    in one bulk write every ``flush_interval_s``, and immediately whenever an
+    ambulance changes status. Each worker holds its own copy; changes made by
+    other workers arrive as live-bus deltas through ``apply_remote``, and
+    claims are settled by a conditional write, so a stale copy can lose a
+    claim but never double-assign a unit.
+    """
+
+    def __init__(self, flush_interval_s: float = FLEET_FLUSH_INTERVAL_S) -> None:
+        self.flush_interval_s = flush_interval_s
+        self._ambulances: dict[PydanticObjectId, Ambulance] = {}
+        # Idle ambulances only, kept in step with every update
+        self._idle_index: SpatialIndex[PydanticObjectId] = SpatialIndex()
+        # Whole fleet as NumPy columns for vectorized distance work
+        self.arrays = FleetArrays()
+        self._persisted_status: dict[PydanticObjectId, AmbulanceStatus] = {}
+        self._dirty: set[PydanticObjectId] = set()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._idle_listeners: list[Callable[[], None]] = []
+
+    async def start(self) -> None:
+        await self.load()
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    async def load(self) -> None:
+        ambulances = await Ambulance.find_all().to_list()
+        self._ambulances = {amb.id: amb for amb in ambulances}
+        self._persisted_status = {amb.id: amb.status for amb in ambulances}
+        self._idle_index = SpatialIndex()
+        self.arrays = FleetArrays(capacity=max(len(ambulances), 64))
+        for ambulance in ambulances:
+            self._reindex(ambulance)
+        self._dirty.clear()
+        logger.info("Loaded %s ambulances into fleet state", len(ambulances))
+
+    def get(self, ambulance_id: PydanticObjectId | str) -> Ambulance | None:
+        try:
+            return self._ambulances.get(PydanticObjectId(ambulance_id))
+        except (InvalidId, TypeError):
+            return None
+
+    def all(self) -> list[Ambulance]:
+        return list(self._ambulances.values())
+
+    def has_idle(self) -> bool:
+        return len(self._idle_index) > 0
+
+    def add_idle_listener(self, listener: Callable[[], None]) -> None:
+        """Call ``listener`` whenever an ambulance becomes idle."""
+        self._idle_listeners.append(listener)
+
+    def idle(self) -> list[Ambulance]:
+        return [
+            amb for amb in self._ambulances.values() if amb.status == AmbulanceStatus.IDLE
+        ]
+
+    def nearest_idle(self, lat: float, lng: float, k: int = 1) -> list[tuple[float, Ambulance]]:
+        """Up to ``k`` (distance_km, ambulance) pairs of idle units, closest first."""
+        return [
+            (distance, self._ambulances[ambulance_id])
+            for distance, ambulance_id in self._idle_index.nearest(lat, lng, k)
+        ]
+
+    def idle_distances(self, lats, lngs) -> tuple[np.ndarray, list[Ambulance]]:
+        """Distance matrix (points x idle ambulances, km) and the matching units."""
+        idle = self.arrays.mask(AmbulanceStatus.IDLE)
+        distances = self.arrays.distances(np.asarray(lats), np.asarray(lngs))[:, idle]
+        ambulances = [
+            self._ambulances[ambulance_id]
+            for ambulance_id, is_idle in zip(self.arrays.ids, idle)
+            if is_idle
+        ]
+        return distances, ambulances
+
+    def _reindex(self, ambulance: Ambulance) -> None:
+        self.arrays.upsert(ambulance.id, ambulance.lat, ambulance.lng, ambulance.status)
+        if ambulance.status == AmbulanceStatus.IDLE:
+            self._idle_index.upsert(ambulance.id, ambulance.lat, ambulance.lng)
+        else:
+            self._idle_index.remove(ambulance.id)
+
+    async def update(self, ambulance: Ambulance) -> None:
+        """Record a change; status transitions are persisted right away."""
+        self._ambulances[ambulance.id] = ambulance
+        self._reindex(ambulance)
+        self._dirty.add(ambulance.id)
+        if self._persisted_status.get(ambulance.id) != ambulance.status:
+            await self.flush()
+            if ambulance.status == AmbulanceStatus.IDLE:
+                for listener in self._idle_listeners:
+                    listener()
+
+    def apply_remote(self, message: dict) -> None:
+        """Adopt an ambulances delta broadcast by another worker."""
+        if message["op"] == "remove":
+            for ambulance_id in message["ids"]:
+                ambulance_id = PydanticObjectId(ambulance_id)
+                self._ambulances.pop(ambulance_id, None)
+                self._persisted_status.pop(ambulance_id, None)
+                self._dirty.discard(ambulance_id)
+                self.arrays.remove(ambulance_id)
+                self._idle_index.remove(ambulance_id)
+            return
+        became_idle = False
+        for doc in message["data"]:
+            ambulance = Ambulance.model_validate(doc)
+            # Unflushed local changes are newer than what was broadcast
+            if ambulance.id in self._dirty:
+                continue
+            previous = self._ambulances.get(ambulance.id)
+            became_idle |= ambulance.status == AmbulanceStatus.IDLE and (
+                previous is None or previous.status != AmbulanceStatus.IDLE
+            )
+            self._ambulances[ambulance.id] = ambulance
+            self._persisted_status[ambulance.id] = ambulance.status
+            self._reindex(ambulance)
+        if became_idle:
+            for listener in self._idle_listeners:
+                listener()
+
+    async def claim(
+        self, ambulance_id: PydanticObjectId, event_id: PydanticObjectId
+    ) -> Ambulance | None:
+        """Atomically move an idle ambulance to ENROUTE for ``event_id``.
+
+        The in-memory check-and-set has no await in between, so it cannot race
+        with another dispatch in this process; the conditional update on
+        ``status == idle`` then guards against other processes. Returns None
+        when the ambulance was no longer idle.
+        """
+        ambulance = self._ambulances.get(ambulance_id)
+        if ambulance is None or ambulance.status != AmbulanceStatus.IDLE:
+            return None
+        ambulance.status = AmbulanceStatus.ENROUTE
+        ambulance.event_id = event_id
+        self._reindex(ambulance)
+
+        try:
+            result = await Ambulance.get_pymongo_collection().update_one(
+                {"_id": ambulance_id, "status": AmbulanceStatus.IDLE.value},
+                {"$set": {"status": AmbulanceStatus.ENROUTE.value, "event_id": event_id}},
+            )
+        except Exception:
+            ambulance.status = AmbulanceStatus.IDLE
+            ambulance.event_id = None
+            self._reindex(ambulance)
+            raise
+        if result.matched_count == 0:
+            # Claimed elsewhere first; adopt the stored state
+            logger.info("Ambulance %s was already claimed", ambulance_id)
+            stored = await Ambulance.get(ambulance_id)
+            if stored is not None:
+                self._ambulances[ambulance_id] = stored
+                self._persisted_status[ambulance_id] = stored.status
+                self._reindex(stored)
+            return None
+        self._persisted_status[ambulance_id] = AmbulanceStatus.ENROUTE
+        return ambulance
+
+    async def flush(self) -> None:
+        """Write every dirty ambulance to MongoDB in a single bulk write."""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+            ids, self._dirty = self._dirty, set()
+            operations = []
+            written: dict[PydanticObjectId, AmbulanceStatus] = {}
+            for ambulance_id in ids:
+                ambulance = self._ambulances.get(ambulance_id)
+                if ambulance is None:
+                    continue
+                fields = get_dict(ambulance, to_db=True, exclude={"_id"})
+                operations.append(UpdateOne({"_id": ambulance_id}, {"$set": fields}))
+                written[ambulance_id] = ambulance.status
+            if not operations:
+                return
+            try:
+                await Ambulance.get_pymongo_collection().bulk_write(
+                    operations, ordered=False
+                )
+            except Exception as e:
+                # Keep the changes dirty so the next flush retries them
+                logger.error("Fleet state flush failed: %s", e)
+                self._dirty |= ids
+                return
+            self._persisted_status.update(written)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_s)
+            await self.flush()
+
+
+fleet = FleetState()
@@ -0,0 +1,41 @@
+import math
+
+EARTH_RADIUS_KM = 6371
+
+# Straight-line estimates: road distance is ~1.4x the crow-flies distance
+STRAIGHT_DETOUR = 1.4
+STRAIGHT_SPEED_KMH = 40.0
+# Spacing of the points on an estimated straight-line path
+STRAIGHT_PATH_STEP_KM = 0.05
+
+
+def calculate_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Calculate distance between two points in kilometers (Haversine formula)."""
+    R = EARTH_RADIUS_KM
+    dlat = math.radians(lat2 - lat1)
+    dlng = math.radians(lng2 - lng1)
+    a = (
+        math.sin(dlat / 2) ** 2
+        + math.cos(math.radians(lat1))
+        * math.cos(math.radians(lat2))
+        * math.sin(dlng / 2) ** 2
+    )
+    c = 2 * math.asin(math.sqrt(a))
+    return R * c
+
+
+def estimate_travel_seconds(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Rough road travel time from the straight-line distance."""
+    return calculate_distance(lat1, lng1, lat2, lng2) * STRAIGHT_DETOUR / STRAIGHT_SPEED_KMH * 3600
+
+
+def straight_line_route(
+    lat1: float, lng1: float, lat2: float, lng2: float
+) -> tuple[int, list[tuple[float, float]]]:
+    """Estimated (eta_seconds, path) along the straight line between two points."""
+    steps = max(1, math.ceil(calculate_distance(lat1, lng1, lat2, lng2) / STRAIGHT_PATH_STEP_KM))
+    path = [
+        (lat1 + (lat2 - lat1) * i / steps, lng1 + (lng2 - lng1) * i / steps)
+        for i in range(steps + 1)
+    ]
+    return round(estimate_travel_seconds(lat1, lng1, lat2, lng2)), path
@@ -0,0 +1,261 @@
+"""Broadcast bus carrying live deltas between uvicorn workers.
+
+Each worker publishes the deltas its own writers produce and delivers every
+delta it receives (its own included) to the sockets attached to it, so any
+number of workers can serve /ws/live.
+
+LIVE_BUS_URL picks the implementation:
+
+    (unset)                    in-process, single worker
+    redis://host:6379/0        Redis pub/sub (requires the `redis` package)
+    tcp://127.0.0.1:8765       local broker started with `python -m utils.live_bus`
+"""
+
+import asyncio
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Callable
+from urllib.parse import urlparse
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+LIVE_BUS_URL = os.getenv("LIVE_BUS_URL", "")
+LIVE_BUS_CHANNEL = os.getenv("LIVE_BUS_CHANNEL", "lifeline:live")
+# Messages buffered while the bus is down; the oldest are dropped beyond this
+LIVE_BUS_QUEUE_SIZE = int(os.getenv("LIVE_BUS_QUEUE_SIZE", "1024"))
+# Reconnect backoff, doubling from the minimum up to the maximum
+LIVE_BUS_RETRY_MIN_S = float(os.getenv("LIVE_BUS_RETRY_MIN_S", "0.5"))
+LIVE_BUS_RETRY_MAX_S = float(os.getenv("LIVE_BUS_RETRY_MAX_S", "10"))
+# Line limit for the socket broker; one line carries one flushed delta
+LIVE_BUS_LINE_LIMIT = 16 * 1024 * 1024
+
+Deliver = Callable[[dict[str, Any]], None]
+
+
+class LiveBus(ABC):
+    """Publishes live deltas and hands every received delta to ``deliver``."""
+
+    def __init__(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def start(self) -> None:
+        pass
+
+    @abstractmethod
+    def publish(self, message: dict[str, Any]) -> None: ...
+
+    async def close(self) -> None:
+        pass
+
+
+class InProcessBus(LiveBus):
+    """Delivers straight to this process' sockets."""
+
+    def publish(self, message: dict[str, Any]) -> None:
+        self._deliver(message)
+
+
+class _NetworkBus(LiveBus):
+    """Shared plumbing: a bounded outbound queue, a receive loop and reconnects.
+
+    Publishing never waits; messages queue while the connection is down and
+    are sent once it is back. A message in flight when the connection drops
+    is lost.
+    """
+
+    def __init__(self, deliver: Deliver, queue_size: int = LIVE_BUS_QUEUE_SIZE) -> None:
+        super().__init__(deliver)
+        self._outbound: asyncio.Queue[bytes] = asyncio.Queue(queue_size)
+        self._task: asyncio.Task | None = None
+        self.connected = asyncio.Event()
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    def publish(self, message: dict[str, Any]) -> None:
+        if self._outbound.full():
+            self._outbound.get_nowait()
+            logger.warning("Live bus queue full, dropping the oldest message")
+        self._outbound.put_nowait(orjson.dumps(message))
+
+    def _received(self, data: bytes) -> None:
+        try:
+            self._deliver(orjson.loads(data))
+        except Exception as e:
+            logger.warning("Dropping malformed live bus message: %s", e)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.wait([self._task])
+            self._task = None
+
+    async def _run(self) -> None:
+        delay = LIVE_BUS_RETRY_MIN_S
+        while True:
+            try:
+                await self._connect()
+            except Exception as e:
+                logger.warning("Live bus connect failed, retrying in %.1fs: %s", delay, e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, LIVE_BUS_RETRY_MAX_S)
+                continue
+            delay = LIVE_BUS_RETRY_MIN_S
+            self.connected.set()
+            loops = [
+                asyncio.create_task(self._send_loop()),
+                asyncio.create_task(self._receive_loop()),
+            ]
+            try:
+                done, _ = await asyncio.wait(loops, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        logger.error("Live bus connection failed: %s", task.exception())
+            finally:
+                self.connected.clear()
+                for task in loops:
+                    task.cancel()
+                await asyncio.wait(loops)
+                try:
+                    await self._disconnect()
+                except Exception:
+                    pass
+            logger.warning("Live bus disconnected, reconnecting in %.1fs", delay)
+            await asyncio.sleep(delay)
+
+    @abstractmethod
+    async def _connect(self) -> None: ...
+
+    @abstractmethod
+    async def _disconnect(self) -> None: ...
+
+    @abstractmethod
+    async def _send_loop(self) -> None: ...
+
+    @abstractmethod
+    async def _receive_loop(self) -> None: ...
+
+
+class RedisBus(_NetworkBus):
+    def __init__(self, deliver: Deliver, url: str, channel: str = LIVE_BUS_CHANNEL):
+        super().__init__(deliver)
+        self.url = url
+        self.channel = channel
+
+    async def _connect(self) -> None:
+        import redis.asyncio as redis  # optional dependency
+
+        self._redis = redis.from_url(self.url)
+        self._pubsub = self._redis.pubsub()
+        await self._pubsub.subscribe(self.channel)
+
+    async def _disconnect(self) -> None:
+        await self._pubsub.aclose()
+        await self._redis.aclose()
+
+    async def _send_loop(self) -> None:
+        while True:
+            data = await self._outbound.get()
+            try:
+                await self._redis.publish(self.channel, data)
+            except Exception as e:
+                logger.warning("Live bus publish failed: %s", e)
+
+    async def _receive_loop(self) -> None:
+        async for item in self._pubsub.listen():
+            if item.get("type") == "message":
+                self._received(item["data"])
+
+
+class SocketBus(_NetworkBus):
+    """Client of the newline-delimited JSON broker in this module."""
+
+    def __init__(self, deliver: Deliver, host: str, port: int) -> None:
+        super().__init__(deliver)
+        self.host = host
+        self.port = port
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(
+            self.host, self.port, limit=LIVE_BUS_LINE_LIMIT
+        )
+
+    async def _disconnect(self) -> None:
+        self._writer.close()
+
+    async def _send_loop(self) -> None:
+        while True:
+            data = await self._outbound.get()
+            self._writer.write(data + b"\n")
+            await self._writer.drain()
+
+    async def _receive_loop(self) -> None:
+        while line := await self._reader.readline():
+            self._received(line)
+        logger.error("Live bus broker closed the connection")
+
+
+def create_bus(deliver: Deliver, url: str = LIVE_BUS_URL) -> LiveBus:
+    if not url:
+        return InProcessBus(deliver)
+    parsed = urlparse(url)
+    if parsed.scheme in ("redis", "rediss"):
+        return RedisBus(deliver, url)
+    if parsed.scheme == "tcp":
+        return SocketBus(deliver, parsed.hostname or "127.0.0.1", parsed.port or 8765)
+    raise ValueError(f"Unsupported LIVE_BUS_URL: {url}")
+
+
+async def start_broker(
+    host: str = "127.0.0.1", port: int = 8765, queue_size: int = LIVE_BUS_QUEUE_SIZE
+) -> asyncio.Server:
+    """Relay every line received from any worker to all connected workers.
+
+    Each worker gets its own bounded queue and writer task, so a slow worker
+    cannot stall the others; one that falls ``queue_size`` lines behind is
+    disconnected and reconnects.
+    """
+    peers: dict[asyncio.StreamWriter, asyncio.Queue[bytes]] = {}
+
+    async def forward(queue: asyncio.Queue[bytes], writer: asyncio.StreamWriter):
+        while True:
+            writer.write(await queue.get())
+            await writer.drain()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        queue: asyncio.Queue[bytes] = asyncio.Queue(queue_size)
+        peers[writer] = queue
+        sender = asyncio.create_task(forward(queue, writer))
+        try:
+            while line := await reader.readline():
+                for peer, peer_queue in list(peers.items()):
+                    try:
+                        peer_queue.put_nowait(line)
+                    except asyncio.QueueFull:
+                        logger.warning("Live bus worker too slow, disconnecting it")
+                        peers.pop(peer, None)
+                        peer.close()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+            logger.warning("Live bus worker connection failed: %s", e)
+        finally:
+            peers.pop(writer, None)
+            sender.cancel()
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port, limit=LIVE_BUS_LINE_LIMIT)
+    logger.info("Live bus broker listening on %s:%s", host, port)
+    return server
+
+
+async def run_broker(host: str = "127.0.0.1", port: int = 8765) -> None:
+    server = await start_broker(host, port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_broker(port=int(os.getenv("LIVE_BUS_PORT", "8765"))))
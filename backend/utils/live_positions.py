@@ -0,0 +1,74 @@
+"""Compact binary position ticks for the opt-in /ws/live binary stream.
+
+A client that subscribes with ``"binary": true`` receives ambulance updates
+that only moved the ambulance (lat, lng, eta, path cursor, updated_at) as a binary
+frame instead of JSON. All integers and floats are little-endian:
+
+    header   u8 version | u32 seq | u32 count
+    record   u32 index  | f32 lat | f32 lng | u16 eta_seconds | u16 path_index  (x count)
+
+``eta_seconds`` is 0xFFFF when unknown; ``path_index`` saturates at 0xFFFF.
+``index`` maps to an ambulance id via the ``index`` object carried by every
+JSON message for ambulances sent to binary clients. Ticks do not carry the
+``path`` polyline, so an update that starts a new leg is always sent as
+JSON. A full JSON ``keyframe`` is also sent periodically; it replaces the
+client's ambulance list.
+"""
+
+import struct
+from typing import Any, Iterable
+
+POSITION_VERSION = 2
+POSITION_HEADER = struct.Struct("<BII")
+POSITION_RECORD = struct.Struct("<IffHH")
+ETA_UNKNOWN = 0xFFFF
+U16_MAX = 0xFFFF
+
+# Fields a position tick may change; anything else needs a JSON update
+POSITION_FIELDS = frozenset({"lat", "lng", "eta_seconds", "path_index", "updated_at"})
+
+
+def is_position_tick(previous: dict[str, Any] | None, current: dict[str, Any]) -> bool:
+    """True when ``current`` differs from ``previous`` only in position fields."""
+    if previous is None:
+        return False
+    return all(
+        previous.get(key) == value
+        for key, value in current.items()
+        if key not in POSITION_FIELDS
+    )
+
+
+class PositionIndex:
+    """Stable, append-only mapping of entity ids to small integers."""
+
+    def __init__(self) -> None:
+        self._index: dict[str, int] = {}
+
+    def get(self, entity_id: str) -> int:
+        index = self._index.get(entity_id)
+        if index is None:
+            index = self._index[entity_id] = len(self._index)
+        return index
+
+    def mapping(self, entity_ids: Iterable[str]) -> dict[str, int]:
+        return {entity_id: self.get(entity_id) for entity_id in entity_ids}
+
+
+def encode_positions(seq: int, index: PositionIndex, docs: list[dict[str, Any]]) -> bytes:
+    buffer = bytearray(POSITION_HEADER.size + POSITION_RECORD.size * len(docs))
+    POSITION_HEADER.pack_into(buffer, 0, POSITION_VERSION, seq & 0xFFFFFFFF, len(docs))
+    offset = POSITION_HEADER.size
+    for doc in docs:
+        eta = doc.get("eta_seconds")
+        POSITION_RECORD.pack_into(
+            buffer,
+            offset,
+            index.get(str(doc["_id"])),
+            doc["lat"],
+            doc["lng"],
+            ETA_UNKNOWN if eta is None else min(int(eta), ETA_UNKNOWN - 1),
+            min(int(doc.get("path_index") or 0), U16_MAX),
+        )
+        offset += POSITION_RECORD.size
+    return bytes(buffer)
@@ -1,60 +1,680 @@
+import asyncio
 import logging
-from typing import Any
+import os
+import uuid
+from collections import OrderedDict, defaultdict, deque
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Iterable
 
+import orjson
 from fastapi import WebSocket
-from fastapi.encoders import jsonable_encoder
+from beanie import Document
 
-from models import Ambulance, Event, Camera
+from models import Ambulance, Camera, Event, EventStatus
+from schemas import BoundingBox
+from utils.live_bus import create_bus
+from utils.live_positions import PositionIndex, encode_positions, is_position_tick
+from utils.response_cache import response_cache
+from utils.viewport import ViewportIndex
 
 logger = logging.getLogger(__name__)
 
+# Per-client outbound queue bound and what to do when a client falls behind
+LIVE_WS_QUEUE_SIZE = int(os.getenv("LIVE_WS_QUEUE_SIZE", "256"))
+LIVE_WS_OVERFLOW_POLICY = os.getenv("LIVE_WS_OVERFLOW_POLICY", "coalesce")
+# Minimum spacing between two broadcasts of the same entity type
+LIVE_WS_FLUSH_INTERVAL_MS = int(os.getenv("LIVE_WS_FLUSH_INTERVAL_MS", "100"))
+# How often binary-stream clients get a full JSON ambulance keyframe
+LIVE_WS_KEYFRAME_INTERVAL_S = float(os.getenv("LIVE_WS_KEYFRAME_INTERVAL_S", "5"))
+# Number of recent deltas kept for clients resuming after a reconnect
+LIVE_WS_REPLAY_SIZE = int(os.getenv("LIVE_WS_REPLAY_SIZE", "1024"))
+# Resolved events kept in snapshots (most recent first); older ones are dropped
+LIVE_WS_RESOLVED_EVENTS = int(os.getenv("LIVE_WS_RESOLVED_EVENTS", "200"))
 
-async def broadcast_all(type: str):
-    """Broadcast the current state of all ambulances to connected clients."""
-    if type == "ambulances":
-        all_ambulances = await Ambulance.find_all().to_list()
-        print("Broadcasting ambulances:", all_ambulances)
-        await broadcast_update("ambulances", all_ambulances)
-    if type == "events":
-        all_events = await Event.find_all().to_list()
-        await broadcast_update("events", all_events)
-    if type == "cameras":
-        all_cameras = await Camera.find_all().to_list()
-        await broadcast_update("cameras", all_cameras)
+LIVE_ENTITY_TYPES = ("ambulances", "events", "cameras")
+
+
+# Live protocol
+# -------------
+# Every message sent on /ws/live carries the entity ``type``, an ``op`` and a
+# monotonically increasing ``seq``:
+#
+#   {"type": "ambulances", "op": "upsert", "seq": 12, "data": [{...}, ...]}
+#   {"type": "events", "op": "remove", "seq": 13, "ids": ["..."]}
+#
+# On connect the server sends one combined snapshot,
+#
+#   {"op": "snapshot", "epoch": "...", "seq": 11,
+#    "data": {"ambulances": [...], "events": [...], "cameras": [...]}}
+#
+# A client reconnecting with ``/ws/live?epoch=...&since=<last seq>`` instead
+# gets {"op": "resume", "epoch": ..., "seq": since} followed by the missed
+# deltas, as long as they are still in the replay buffer and the server (whose
+# sequence numbers are only meaningful within one ``epoch``) is the same.
+#
+# Deltas are produced by the writer that changed the document, so the
+# broadcast path never reads from the database. Writers only mark entities
+# dirty; each entity type is flushed at most once per
+# LIVE_WS_FLUSH_INTERVAL_MS, carrying the latest state of everything that
+# changed in the window. Flushed deltas go through the live bus so every
+# worker delivers them, and ``seq`` is stamped by the delivering worker.
+# Deltas from other workers are also handed to remote listeners, which keep
+# per-process state such as the fleet in step. Each
+# message is encoded once and the same text frame is handed to every socket.
+#
+# Clients may narrow what they receive by sending
+#
+#   {"action": "subscribe", "types": ["ambulances"],
+#    "bbox": {"south": .., "west": .., "north": .., "east": ..}}
+#
+# With a bbox, a client only gets entities inside it, plus a remove when an
+# entity it was shown leaves the box. Adding ``"binary": true`` switches
+# ambulance position ticks to packed binary frames (see utils.live_positions).
+
+
+class LiveFrame:
+    """A live message plus its JSON text, encoded lazily and only once.
+
+    ``binary`` holds a packed alternative encoding sent instead of the text.
+    """
+
+    __slots__ = ("message", "binary", "_text")
+
+    def __init__(self, message: dict[str, Any], binary: bytes | None = None) -> None:
+        self.message = message
+        self.binary = binary
+        self._text: str | None = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = orjson.dumps(self.message).decode()
+        return self._text
+
+
+def encode_documents(documents: Iterable[Document]) -> list[dict[str, Any]]:
+    """Dump documents to JSON-ready dicts (``_id`` alias, ISO datetimes)."""
+    return [doc.model_dump(mode="json", by_alias=True) for doc in documents]
+
+
+async def broadcast_upsert(entity_type: str, documents: Document | Iterable[Document]):
+    """Broadcast changed or inserted documents of ``entity_type``."""
+    if isinstance(documents, Document):
+        documents = [documents]
+    response_cache.invalidate(entity_type)
+    coalescer.mark_upserted(entity_type, documents)
+
+
+async def broadcast_remove(entity_type: str, ids: Iterable[Any]):
+    """Broadcast the removal of documents of ``entity_type`` by id."""
+    response_cache.invalidate(entity_type)
+    coalescer.mark_removed(entity_type, ids)
+
+
+class BroadcastCoalescer:
+    """Collects dirty entities and flushes each type at most once per interval."""
+
+    def __init__(
+        self,
+        publish: Callable[[dict[str, Any]], None],
+        interval_ms: int = LIVE_WS_FLUSH_INTERVAL_MS,
+    ) -> None:
+        self._publish = publish
+        self.interval = interval_ms / 1000
+        self._upserts: dict[str, dict[str, Document]] = {}
+        self._removes: dict[str, set[str]] = {}
+        self._scheduled: set[str] = set()
+        self._last_flush: dict[str, float] = {}
+
+    def mark_upserted(self, entity_type: str, documents: Iterable[Document]) -> None:
+        upserts = self._upserts.setdefault(entity_type, {})
+        removes = self._removes.setdefault(entity_type, set())
+        for doc in documents:
+            key = str(doc.id)
+            removes.discard(key)
+            upserts[key] = doc
+        self._schedule(entity_type)
+
+    def mark_removed(self, entity_type: str, ids: Iterable[Any]) -> None:
+        upserts = self._upserts.setdefault(entity_type, {})
+        removes = self._removes.setdefault(entity_type, set())
+        for entity_id in ids:
+            key = str(entity_id)
+            upserts.pop(key, None)
+            removes.add(key)
+        self._schedule(entity_type)
+
+    def _schedule(self, entity_type: str) -> None:
+        if entity_type in self._scheduled:
+            return
+        self._scheduled.add(entity_type)
+        loop = asyncio.get_running_loop()
+        last = self._last_flush.get(entity_type)
+        delay = 0.0 if last is None else max(0.0, last + self.interval - loop.time())
+        loop.call_later(delay, self.flush, entity_type)
+
+    def flush(self, entity_type: str) -> None:
+        """Publish the latest state of every entity marked since the last flush."""
+        self._scheduled.discard(entity_type)
+        self._last_flush[entity_type] = asyncio.get_running_loop().time()
+        upserts = self._upserts.pop(entity_type, {})
+        removes = self._removes.pop(entity_type, set())
+        if removes:
+            self._publish({"type": entity_type, "op": "remove", "ids": sorted(removes)})
+        if upserts:
+            # Dumped at flush time, so intermediate states are never encoded
+            self._publish(
+                {
+                    "type": entity_type,
+                    "op": "upsert",
+                    "data": encode_documents(upserts.values()),
+                }
+            )
+
+
+class OverflowPolicy(str, Enum):
+    COALESCE = "coalesce"  # collapse the backlog to the latest state per entity
+    DISCONNECT = "disconnect"  # drop the slow client
+
+
+def coalesce_frames(frames: Iterable[LiveFrame]) -> list[LiveFrame]:
+    """Collapse queued deltas to at most one upsert and one remove per type."""
+    latest: dict[str, dict[str, tuple[str, Any]]] = {}
+    seqs: dict[str, int] = {}
+    indexes: dict[str, dict[str, int]] = {}
+    # Snapshot/resume frames only ever lead a client's queue; keep them first
+    control: list[LiveFrame] = []
+    for frame in frames:
+        message = frame.message
+        if "type" not in message:
+            control.append(frame)
+            continue
+        entity_type = message["type"]
+        entities = latest.setdefault(entity_type, {})
+        seqs[entity_type] = max(seqs.get(entity_type, 0), message["seq"])
+        if "index" in message:
+            indexes.setdefault(entity_type, {}).update(message["index"])
+        if message["op"] == "remove":
+            for entity_id in message["ids"]:
+                entities[entity_id] = ("remove", entity_id)
+        else:
+            for doc in message["data"]:
+                entities[str(doc.get("_id"))] = ("upsert", doc)
+
+    merged: list[LiveFrame] = control
+    for entity_type, entities in latest.items():
+        removed = [value for op, value in entities.values() if op == "remove"]
+        upserted = [value for op, value in entities.values() if op == "upsert"]
+        seq = seqs[entity_type]
+        if removed:
+            merged.append(
+                LiveFrame(
+                    {"type": entity_type, "op": "remove", "ids": removed, "seq": seq}
+                )
+            )
+        if upserted:
+            message = {"type": entity_type, "op": "upsert", "data": upserted, "seq": seq}
+            if entity_type in indexes:
+                message["index"] = indexes[entity_type]
+            merged.append(LiveFrame(message))
+    return merged
+
+
+class LiveClient:
+    """A connected socket with its own bounded outbound queue and writer task."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        queue_size: int = LIVE_WS_QUEUE_SIZE,
+        policy: OverflowPolicy = OverflowPolicy(LIVE_WS_OVERFLOW_POLICY),
+    ) -> None:
+        self.websocket = websocket
+        self.queue_size = queue_size
+        self.policy = policy
+        self.types: set[str] = set(LIVE_ENTITY_TYPES)
+        self.bbox: BoundingBox | None = None
+        self.binary = False
+        self._pending: deque[LiveFrame] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self, on_done: Callable[[], None]) -> None:
+        self._task = asyncio.create_task(self._run())
+        self._task.add_done_callback(lambda task: self._finished(task, on_done))
+
+    def _finished(self, task: asyncio.Task, on_done: Callable[[], None]) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.info("Live WS writer stopped: %s", task.exception())
+        on_done()
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    def enqueue(self, frame: LiveFrame) -> bool:
+        """Queue a frame without blocking; False means the client must go."""
+        if len(self._pending) >= self.queue_size:
+            if self.policy is OverflowPolicy.DISCONNECT:
+                return False
+            self._pending = deque(coalesce_frames([*self._pending, frame]))
+        else:
+            self._pending.append(frame)
+        self._wakeup.set()
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            while not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            frame = self._pending.popleft()
+            if frame.binary is not None:
+                await self.websocket.send_bytes(frame.binary)
+            else:
+                await self.websocket.send_text(frame.text)
+
+
+class _FrameBuilder:
+    """Builds the frames of one delta, encoding each distinct variant once."""
+
+    def __init__(
+        self, message: dict[str, Any], ticks: set[str], positions: PositionIndex
+    ) -> None:
+        self.message = message
+        self.ticks = ticks
+        self.positions = positions
+        self._cache: dict[tuple, list[LiveFrame]] = {}
+
+    def full(self, binary: bool) -> list[LiveFrame]:
+        key = ("full", binary)
+        if key not in self._cache:
+            if self.message["op"] == "remove":
+                self._cache[key] = self._build(binary, [], self.message["ids"])
+            else:
+                self._cache[key] = self._build(binary, self.message["data"], [])
+        return self._cache[key]
+
+    def subset(
+        self, binary: bool, docs: list[dict[str, Any]], removed: list[str]
+    ) -> list[LiveFrame]:
+        key = (binary, tuple(removed), *(id(doc) for doc in docs))
+        if key not in self._cache:
+            self._cache[key] = self._build(binary, docs, removed)
+        return self._cache[key]
+
+    def _build(
+        self, binary: bool, docs: list[dict[str, Any]], removed: list[str]
+    ) -> list[LiveFrame]:
+        entity_type = self.message["type"]
+        seq = self.message["seq"]
+        frames: list[LiveFrame] = []
+        if removed:
+            frames.append(
+                LiveFrame({"type": entity_type, "op": "remove", "ids": removed, "seq": seq})
+            )
+        if not docs:
+            return frames
+        if not binary or entity_type != "ambulances":
+            frames.append(
+                LiveFrame({"type": entity_type, "op": "upsert", "data": docs, "seq": seq})
+            )
+            return frames
+
+        moved = [doc for doc in docs if str(doc["_id"]) in self.ticks]
+        changed = [doc for doc in docs if str(doc["_id"]) not in self.ticks]
+        if moved:
+            frames.append(
+                LiveFrame(
+                    {"type": entity_type, "op": "upsert", "data": moved, "seq": seq},
+                    binary=encode_positions(seq, self.positions, moved),
+                )
+            )
+        if changed:
+            index = self.positions.mapping(str(doc["_id"]) for doc in changed)
+            frames.append(
+                LiveFrame(
+                    {
+                        "type": entity_type,
+                        "op": "upsert",
+                        "data": changed,
+                        "index": index,
+                        "seq": seq,
+                    }
+                )
+            )
+        return frames
 
 
 class LiveConnectionManager:
     def __init__(self) -> None:
-        self._connections: set[WebSocket] = set()
+        self._clients: dict[WebSocket, LiveClient] = {}
+        self._sequence = 0
+        self._viewports: ViewportIndex[LiveClient] = ViewportIndex()
+        # entity type -> entity id -> viewport clients currently showing it
+        self._viewers: dict[str, dict[str, set[LiveClient]]] = defaultdict(dict)
+        # entity type -> entity id -> latest broadcast document
+        self._latest: dict[str, dict[str, dict[str, Any]]] = defaultdict(dict)
+        # Ids of resolved events still in _latest, oldest first
+        self._resolved: OrderedDict[str, None] = OrderedDict()
+        self._positions = PositionIndex()
+        self._keyframe_timer: asyncio.TimerHandle | None = None
+        self.epoch = uuid.uuid4().hex
+        self._replay: deque[dict[str, Any]] = deque(maxlen=LIVE_WS_REPLAY_SIZE)
 
-    async def connect(self, websocket: WebSocket) -> None:
+    async def prime(self) -> None:
+        """Load current state once so snapshots never hit the database."""
+        for entity_type, model in (
+            ("ambulances", Ambulance),
+            ("events", Event),
+            ("cameras", Camera),
+        ):
+            documents = await model.find_all().to_list()
+            if model is Event:
+                # Resolved events last, so only the most recent ones are kept
+                documents.sort(
+                    key=lambda event: (
+                        event.status == EventStatus.RESOLVED,
+                        (event.resolved_at or datetime.min).replace(tzinfo=None),
+                    )
+                )
+            self._latest[entity_type] = {}
+            for doc in encode_documents(documents):
+                self._remember(entity_type, doc)
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        since: int | None = None,
+        epoch: str | None = None,
+    ) -> None:
         await websocket.accept()
-        self._connections.add(websocket)
-        logger.info("Live WS connected (%s clients)", len(self._connections))
+        client = LiveClient(websocket)
+        client.start(on_done=lambda: self._drop(websocket))
+        self._clients[websocket] = client
+        logger.info("Live WS connected (%s clients)", len(self._clients))
+
+        missed = self._missed_since(since) if epoch == self.epoch else None
+        if missed is None:
+            self._send(websocket, client, [self._snapshot()])
+        else:
+            resume = {"op": "resume", "epoch": self.epoch, "seq": since}
+            self._send(websocket, client, [LiveFrame(resume), *map(LiveFrame, missed)])
+
+    def _missed_since(self, since: int | None) -> list[dict[str, Any]] | None:
+        """Deltas after ``since``, or None when they are no longer buffered."""
+        if since is None or since > self._sequence:
+            return None
+        if since == self._sequence:
+            return []
+        if not self._replay or self._replay[0]["seq"] > since + 1:
+            return None
+        return [message for message in self._replay if message["seq"] > since]
+
+    def _snapshot(self) -> LiveFrame:
+        return LiveFrame(
+            {
+                "op": "snapshot",
+                "epoch": self.epoch,
+                "seq": self._sequence,
+                "data": {
+                    entity_type: list(self._latest[entity_type].values())
+                    for entity_type in LIVE_ENTITY_TYPES
+                },
+            }
+        )
 
     async def disconnect(self, websocket: WebSocket) -> None:
-        self._connections.discard(websocket)
-        logger.info("Live WS disconnected (%s clients)", len(self._connections))
+        self._drop(websocket)
 
-    async def broadcast(self, payload: dict[str, Any]) -> None:
-        if not self._connections:
+    def _drop(self, websocket: WebSocket) -> None:
+        client = self._clients.pop(websocket, None)
+        if client is None:
             return
-        dead: list[WebSocket] = []
-        for websocket in self._connections:
-            try:
-                await websocket.send_json(payload)
-            except Exception:
-                dead.append(websocket)
-        for websocket in dead:
-            self._connections.discard(websocket)
+        client.stop()
+        self._viewports.remove(client)
+        self._forget_viewer(client)
+        logger.info("Live WS disconnected (%s clients)", len(self._clients))
+
+    def _forget_viewer(self, client: LiveClient) -> dict[str, set[str]]:
+        """Remove ``client`` from every viewer set; return what it was shown."""
+        shown: dict[str, set[str]] = defaultdict(set)
+        for entity_type, viewers in self._viewers.items():
+            for entity_id in [key for key, clients in viewers.items() if client in clients]:
+                viewers[entity_id].discard(client)
+                if not viewers[entity_id]:
+                    del viewers[entity_id]
+                shown[entity_type].add(entity_id)
+        return shown
+
+    def _send(self, websocket: WebSocket, client: LiveClient, frames: list[LiveFrame]):
+        for frame in frames:
+            if not client.enqueue(frame):
+                logger.warning("Live WS client too slow, disconnecting")
+                self._drop(websocket)
+                asyncio.create_task(_close_quietly(websocket))
+                return
+
+    def subscribe(
+        self,
+        websocket: WebSocket,
+        types: Iterable[str] | None = None,
+        bbox: BoundingBox | None = None,
+        binary: bool = False,
+    ) -> None:
+        """Replace the entity types, viewport and encoding a client receives."""
+        client = self._clients.get(websocket)
+        if client is None:
+            return
+        shown = self._forget_viewer(client)
+        client.types = set(types) if types is not None else set(LIVE_ENTITY_TYPES)
+        client.bbox = bbox
+        client.binary = binary
+        if bbox is None:
+            self._viewports.remove(client)
+        else:
+            self._viewports.add(client, bbox)
+            self._send(websocket, client, self._rebind_viewport(client, shown))
+        if binary and "ambulances" in client.types:
+            self._send(websocket, client, [self._keyframe(client)])
+            self._schedule_keyframes()
+
+    def _rebind_viewport(
+        self, client: LiveClient, shown: dict[str, set[str]]
+    ) -> list[LiveFrame]:
+        """Register what a new bbox shows; remove what it no longer shows."""
+        frames = []
+        for entity_type in LIVE_ENTITY_TYPES:
+            if entity_type not in client.types:
+                continue
+            viewers = self._viewers[entity_type]
+            visible = [
+                doc
+                for doc in self._latest[entity_type].values()
+                if client.bbox.contains(doc["lat"], doc["lng"])
+            ]
+            for doc in visible:
+                viewers.setdefault(str(doc["_id"]), set()).add(client)
+            previous = shown.get(entity_type, set())
+            stale = sorted(previous - {str(doc["_id"]) for doc in visible})
+            entered = [doc for doc in visible if str(doc["_id"]) not in previous]
+            seq = self._sequence
+            if stale:
+                frames.append(
+                    LiveFrame({"type": entity_type, "op": "remove", "ids": stale, "seq": seq})
+                )
+            if entered:
+                frames.append(
+                    LiveFrame({"type": entity_type, "op": "upsert", "data": entered, "seq": seq})
+                )
+        return frames
+
+    def broadcast(self, payload: dict[str, Any]) -> None:
+        """Enqueue ``payload`` for every client; never waits on a socket."""
+        self._sequence += 1
+        message = {**payload, "seq": self._sequence}
+        self._replay.append(message)
+        entity_type = message["type"]
+        # Writes made by other workers reach this one's cache only via the bus
+        response_cache.invalidate(entity_type)
+        ticks = self._track_latest(message)
+        routed = self._route_to_viewports(message)
+        builder = _FrameBuilder(message, ticks, self._positions)
+        for websocket, client in list(self._clients.items()):
+            if entity_type not in client.types:
+                continue
+            if client.bbox is None:
+                frames = builder.full(client.binary)
+            else:
+                docs, removed = routed.get(client, ([], []))
+                frames = builder.subset(client.binary, docs, removed)
+            self._send(websocket, client, frames)
+
+    def _track_latest(self, message: dict[str, Any]) -> set[str]:
+        """Record the latest documents; return ids whose change is a position tick."""
+        latest = self._latest[message["type"]]
+        if message["op"] == "remove":
+            for entity_id in message["ids"]:
+                latest.pop(entity_id, None)
+                self._resolved.pop(entity_id, None)
+            return set()
+        ticks: set[str] = set()
+        for doc in message["data"]:
+            entity_id = str(doc.get("_id"))
+            if message["type"] == "ambulances" and is_position_tick(
+                latest.get(entity_id), doc
+            ):
+                ticks.add(entity_id)
+            self._remember(message["type"], doc)
+        return ticks
+
+    def _remember(self, entity_type: str, doc: dict[str, Any]) -> None:
+        """Store the latest document, keeping only the newest resolved events."""
+        entity_id = str(doc.get("_id"))
+        self._latest[entity_type][entity_id] = doc
+        if entity_type != "events":
+            return
+        if doc.get("status") != EventStatus.RESOLVED.value:
+            self._resolved.pop(entity_id, None)
+            return
+        self._resolved[entity_id] = None
+        self._resolved.move_to_end(entity_id)
+        while len(self._resolved) > LIVE_WS_RESOLVED_EVENTS:
+            oldest, _ = self._resolved.popitem(last=False)
+            self._latest["events"].pop(oldest, None)
+
+    def _route_to_viewports(
+        self, message: dict[str, Any]
+    ) -> dict[LiveClient, tuple[list[dict[str, Any]], list[str]]]:
+        """Split a delta into per-client (upserted docs, removed ids)."""
+        entity_type = message["type"]
+        viewers = self._viewers[entity_type]
+        routed: dict[LiveClient, tuple[list[dict[str, Any]], list[str]]] = defaultdict(
+            lambda: ([], [])
+        )
+
+        if message["op"] == "remove":
+            for entity_id in message["ids"]:
+                for client in viewers.pop(entity_id, ()):
+                    routed[client][1].append(entity_id)
+            return routed
+
+        for doc in message["data"]:
+            entity_id = str(doc.get("_id"))
+            matching = {
+                client
+                for client in self._viewports.query(doc["lat"], doc["lng"])
+                if entity_type in client.types
+            }
+            for client in viewers.get(entity_id, set()) - matching:
+                routed[client][1].append(entity_id)
+            for client in matching:
+                routed[client][0].append(doc)
+            if matching:
+                viewers[entity_id] = matching
+            else:
+                viewers.pop(entity_id, None)
+        return routed
+
+    def _keyframe(self, client: LiveClient) -> LiveFrame:
+        """Full JSON state of the ambulances a binary client can see."""
+        docs = list(self._latest["ambulances"].values())
+        if client.bbox is not None:
+            docs = [doc for doc in docs if client.bbox.contains(doc["lat"], doc["lng"])]
+            viewers = self._viewers["ambulances"]
+            for doc in docs:
+                viewers.setdefault(str(doc["_id"]), set()).add(client)
+        return LiveFrame(
+            {
+                "type": "ambulances",
+                "op": "keyframe",
+                "data": docs,
+                "index": self._positions.mapping(str(doc["_id"]) for doc in docs),
+                "seq": self._sequence,
+            }
+        )
+
+    def _schedule_keyframes(self) -> None:
+        if self._keyframe_timer is None:
+            self._keyframe_timer = asyncio.get_running_loop().call_later(
+                LIVE_WS_KEYFRAME_INTERVAL_S, self._send_keyframes
+            )
+
+    def _send_keyframes(self) -> None:
+        self._keyframe_timer = None
+        shared: LiveFrame | None = None
+        binary_clients = [
+            (websocket, client)
+            for websocket, client in self._clients.items()
+            if client.binary and "ambulances" in client.types
+        ]
+        for websocket, client in binary_clients:
+            if client.bbox is None:
+                shared = shared or self._keyframe(client)
+                self._send(websocket, client, [shared])
+            else:
+                self._send(websocket, client, [self._keyframe(client)])
+        if binary_clients:
+            self._schedule_keyframes()
 
     def connection_count(self) -> int:
-        return len(self._connections)
+        return len(self._clients)
 
 
-manager = LiveConnectionManager()
+async def _close_quietly(websocket: WebSocket) -> None:
+    try:
+        await websocket.close(code=1013)
+    except Exception:
+        pass
+
 
+# Tags this worker's deltas on the bus so its own echo can be told apart
+WORKER_ID = uuid.uuid4().hex
+RemoteListener = Callable[[dict[str, Any]], None]
+_remote_listeners: dict[str, list[RemoteListener]] = defaultdict(list)
 
-async def broadcast_update(entity_type: str, data: Any) -> None:
-    payload = {"type": entity_type, "data": jsonable_encoder(data)}
-    await manager.broadcast(payload)
+
+def add_remote_listener(entity_type: str, listener: RemoteListener) -> None:
+    """Call ``listener`` with every ``entity_type`` delta written by another worker."""
+    _remote_listeners[entity_type].append(listener)
+
+
+def _publish(message: dict[str, Any]) -> None:
+    bus.publish({**message, "origin": WORKER_ID})
+
+
+def _deliver(message: dict[str, Any]) -> None:
+    origin = message.pop("origin", WORKER_ID)
+    if origin != WORKER_ID:
+        for listener in _remote_listeners[message["type"]]:
+            try:
+                listener(message)
+            except Exception as e:
+                logger.error("Remote %s listener failed: %s", message["type"], e)
+    manager.broadcast(message)
+
+
+manager = LiveConnectionManager()
+bus = create_bus(_deliver)
+coalescer = BroadcastCoalescer(_publish)
@@ -0,0 +1,59 @@
+import hashlib
+from typing import Awaitable, Callable, Hashable, Sequence
+
+import orjson
+from beanie import Document
+from fastapi import Request, Response
+
+
+class ResponseCache:
+    """Pre-serialized JSON list responses with ETag / If-None-Match support.
+
+    Entries are keyed by entity type plus any query parameters and dropped by
+    ``invalidate`` from the same write paths that publish live updates.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple[str, Hashable], tuple[bytes, str]] = {}
+        # Bumped on invalidation so a load racing a write is not cached
+        self._generations: dict[str, int] = {}
+
+    def invalidate(self, entity_type: str) -> None:
+        self._generations[entity_type] = self._generations.get(entity_type, 0) + 1
+        for key in [key for key in self._entries if key[0] == entity_type]:
+            del self._entries[key]
+
+    async def respond(
+        self,
+        request: Request,
+        entity_type: str,
+        load: Callable[[], Awaitable[Sequence[Document]]],
+        key: Hashable = None,
+    ) -> Response:
+        entry = self._entries.get((entity_type, key))
+        if entry is None:
+            generation = self._generations.get(entity_type, 0)
+            documents = await load()
+            body = orjson.dumps(
+                [doc.model_dump(mode="json", by_alias=True) for doc in documents]
+            )
+            entry = (body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+            if self._generations.get(entity_type, 0) == generation:
+                self._entries[(entity_type, key)] = entry
+
+        body, etag = entry
+        # no-cache makes browsers revalidate every poll, which then costs a 304
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        tags = _parse_if_none_match(request.headers.get("if-none-match"))
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _parse_if_none_match(header: str | None) -> set[str]:
+    if not header:
+        return set()
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+response_cache = ResponseCache()
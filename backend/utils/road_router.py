@@ -0,0 +1,186 @@
+"""Local road-graph routing with landmark A* (ALT).
+
+The graph is read from a CSV edge list, e.g. exported from OpenStreetMap:
+
+    source,source_lat,source_lng,target,target_lat,target_lng,seconds,oneway
+    n1,40.4401,-79.9412,n2,40.4409,-79.9412,14.5,0
+
+``oneway`` is optional; edges with 0 (the default) are added in both
+directions. Preprocessing runs a forward and a backward Dijkstra from a few
+far-apart landmarks; the triangle inequality on those distances gives A* a
+much tighter lower bound than straight-line distance, so queries settle only
+a narrow corridor of nodes.
+"""
+
+import csv
+import heapq
+import logging
+import os
+from typing import Iterable
+
+from utils.spatial_index import SpatialIndex
+
+logger = logging.getLogger(__name__)
+
+ROAD_GRAPH_PATH = os.getenv("ROAD_GRAPH_PATH", "data/road_graph.csv")
+ROAD_ROUTER_LANDMARKS = int(os.getenv("ROAD_ROUTER_LANDMARKS", "8"))
+# Speed for the off-graph legs between a point and its nearest graph node
+SNAP_SPEED_KMH = 20.0
+
+INF = float("inf")
+Edge = tuple[int, int, float]
+
+
+class RoadRouter:
+    def __init__(
+        self,
+        coords: list[tuple[float, float]],
+        edges: Iterable[Edge],
+        landmarks: int = ROAD_ROUTER_LANDMARKS,
+    ) -> None:
+        self.coords = coords
+        self._out: list[list[tuple[int, float]]] = [[] for _ in coords]
+        self._in: list[list[tuple[int, float]]] = [[] for _ in coords]
+        for source, target, seconds in edges:
+            self._out[source].append((target, seconds))
+            self._in[target].append((source, seconds))
+
+        self._nodes: SpatialIndex[int] = SpatialIndex()
+        for node, (lat, lng) in enumerate(coords):
+            self._nodes.upsert(node, lat, lng)
+
+        # Per node: distances from each landmark, and to each landmark
+        self.landmarks = self._select_landmarks(min(landmarks, len(coords)))
+        forward = [self._dijkstra(landmark, self._out) for landmark in self.landmarks]
+        backward = [self._dijkstra(landmark, self._in) for landmark in self.landmarks]
+        self._from_landmark = list(zip(*forward)) if forward else [() for _ in coords]
+        self._to_landmark = list(zip(*backward)) if backward else [() for _ in coords]
+
+    @classmethod
+    def from_csv(cls, path: str, landmarks: int = ROAD_ROUTER_LANDMARKS) -> "RoadRouter":
+        ids: dict[str, int] = {}
+        coords: list[tuple[float, float]] = []
+        edges: list[Edge] = []
+
+        def node(name: str, lat: str, lng: str) -> int:
+            if name not in ids:
+                ids[name] = len(coords)
+                coords.append((float(lat), float(lng)))
+            return ids[name]
+
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                source = node(row["source"], row["source_lat"], row["source_lng"])
+                target = node(row["target"], row["target_lat"], row["target_lng"])
+                seconds = float(row["seconds"])
+                edges.append((source, target, seconds))
+                if row.get("oneway", "0") in ("0", "", "false", "no"):
+                    edges.append((target, source, seconds))
+        logger.info("Loaded road graph: %s nodes, %s edges", len(coords), len(edges))
+        return cls(coords, edges, landmarks)
+
+    def _dijkstra(self, source: int, adjacency: list[list[tuple[int, float]]]) -> list[float]:
+        dist = [INF] * len(adjacency)
+        dist[source] = 0.0
+        heap = [(0.0, source)]
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            for neighbour, seconds in adjacency[node]:
+                nd = d + seconds
+                if nd < dist[neighbour]:
+                    dist[neighbour] = nd
+                    heapq.heappush(heap, (nd, neighbour))
+        return dist
+
+    def _select_landmarks(self, count: int) -> list[int]:
+        """Farthest-point selection: each landmark is far from the previous ones."""
+        landmarks: list[int] = []
+        # Distance to the nearest landmark so far (node 0 seeds the first pick)
+        closest = self._dijkstra(0, self._out) if self.coords else []
+        while len(landmarks) < count:
+            candidates = [
+                (d, node) for node, d in enumerate(closest) if d < INF and node not in landmarks
+            ]
+            if not candidates:
+                break
+            landmark = max(candidates)[1]
+            distances = self._dijkstra(landmark, self._out)
+            closest = distances if not landmarks else list(map(min, closest, distances))
+            landmarks.append(landmark)
+        return landmarks
+
+    def _lower_bound(self, node: int, target_from: tuple, target_to: tuple) -> float:
+        best = 0.0
+        # NaN (both unreachable) compares False and is skipped; inf is a valid
+        # proof that the target cannot be reached from ``node``
+        for fv, ft, tv, tt in zip(
+            self._from_landmark[node], target_from, self._to_landmark[node], target_to
+        ):
+            if ft - fv > best:
+                best = ft - fv
+            if tv - tt > best:
+                best = tv - tt
+        return best
+
+    def shortest_path(self, source: int, target: int) -> tuple[float, list[int]] | None:
+        """(seconds, node path) between two graph nodes, or None if unreachable."""
+        target_from = self._from_landmark[target]
+        target_to = self._to_landmark[target]
+        g = {source: 0.0}
+        parent = {source: source}
+        heap = [(self._lower_bound(source, target_from, target_to), source)]
+        settled = set()
+        while heap:
+            _, node = heapq.heappop(heap)
+            if node == target:
+                path = [node]
+                while node != source:
+                    node = parent[node]
+                    path.append(node)
+                return g[target], path[::-1]
+            if node in settled:
+                continue
+            settled.add(node)
+            for neighbour, seconds in self._out[node]:
+                nd = g[node] + seconds
+                if nd < g.get(neighbour, INF):
+                    bound = self._lower_bound(neighbour, target_from, target_to)
+                    if bound == INF:
+                        continue
+                    g[neighbour] = nd
+                    parent[neighbour] = node
+                    heapq.heappush(heap, (nd + bound, neighbour))
+        return None
+
+    def nearest_node(self, lat: float, lng: float) -> tuple[float, int]:
+        return self._nodes.nearest(lat, lng, 1)[0]
+
+    def route(
+        self, origin_lat: float, origin_lng: float, dest_lat: float, dest_lng: float
+    ) -> tuple[int | None, list[tuple[float, float]] | None]:
+        """Same shape as maps_call.compute_route_eta_and_path."""
+        if not self.coords:
+            return None, None
+        origin_km, source = self.nearest_node(origin_lat, origin_lng)
+        dest_km, target = self.nearest_node(dest_lat, dest_lng)
+        result = self.shortest_path(source, target)
+        if result is None:
+            return None, None
+        seconds, nodes = result
+        seconds += (origin_km + dest_km) / SNAP_SPEED_KMH * 3600
+        path = [(origin_lat, origin_lng)] + [self.coords[n] for n in nodes] + [(dest_lat, dest_lng)]
+        return round(seconds), path
+
+
+_router: RoadRouter | None = None
+
+
+def get_road_router(path: str = ROAD_GRAPH_PATH) -> RoadRouter:
+    """Load and preprocess the road graph once per process."""
+    global _router
+    if _router is None:
+        _router = RoadRouter.from_csv(path)
+    return _router
+
@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Origins/destinations are snapped to this grid (~110 m north-south at 0.001)
+ROUTE_CACHE_GRID_DEG = float(os.getenv("ROUTE_CACHE_GRID_DEG", "0.001"))
+ROUTE_CACHE_SIZE = int(os.getenv("ROUTE_CACHE_SIZE", "2048"))
+ROUTE_CACHE_TTL_S = float(os.getenv("ROUTE_CACHE_TTL_S", "1800"))
+# Traffic changes fastest in rush hour, so entries stored then expire sooner
+ROUTE_CACHE_PEAK_TTL_S = float(os.getenv("ROUTE_CACHE_PEAK_TTL_S", "300"))
+ROUTE_CACHE_PEAK_HOURS = os.getenv("ROUTE_CACHE_PEAK_HOURS", "7-10,16-19")
+# SQLite file backing the cache across restarts; empty keeps it in memory only
+ROUTE_CACHE_PATH = os.getenv("ROUTE_CACHE_PATH", "")
+# Expired rows are deleted on startup and after this many writes
+ROUTE_CACHE_PRUNE_EVERY = 1000
+
+Route = tuple[int, list[tuple[float, float]]]
+RouteKey = tuple[int, int, int, int]
+
+
+def parse_hours(spec: str) -> set[int]:
+    """"7-10,16-19" -> {7, 8, 9, 16, 17, 18} (end hour exclusive)."""
+    hours = set()
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        start, _, end = part.partition("-")
+        hours.update(range(int(start), int(end or int(start) + 1)))
+    return hours
+
+
+class RouteCache:
+    """LRU route cache with traffic-aware TTLs and an optional SQLite store.
+
+    Keys snap origin and destination to ``grid_deg`` so routes requested from
+    nearly the same spot (a station, a camera) share an entry. The disk store
+    is read through on a memory miss and written on every put; any error
+    reading or writing it is logged and treated as a miss, never raised.
+    """
+
+    def __init__(
+        self,
+        grid_deg: float = ROUTE_CACHE_GRID_DEG,
+        max_size: int = ROUTE_CACHE_SIZE,
+        ttl_s: float = ROUTE_CACHE_TTL_S,
+        peak_ttl_s: float = ROUTE_CACHE_PEAK_TTL_S,
+        peak_hours: str = ROUTE_CACHE_PEAK_HOURS,
+        path: str = ROUTE_CACHE_PATH,
+    ) -> None:
+        self.grid_deg = grid_deg
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self.peak_ttl_s = peak_ttl_s
+        self.peak_hours = parse_hours(peak_hours)
+        self._entries: OrderedDict[RouteKey, tuple[float, Route]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._db: sqlite3.Connection | None = None
+        self._db_lock = threading.Lock()
+        self._writes = 0
+        if path:
+            try:
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS routes ("
+                    "key TEXT PRIMARY KEY, expires_at REAL, eta INTEGER, path BLOB)"
+                )
+                self._db.commit()
+                self._prune()
+            except sqlite3.Error as e:
+                logger.warning("Route cache store %s unusable, memory only: %s", path, e)
+                self._db = None
+
+    def key(self, origin_lat: float, origin_lng: float, dest_lat: float, dest_lng: float) -> RouteKey:
+        return (
+            round(origin_lat / self.grid_deg),
+            round(origin_lng / self.grid_deg),
+            round(dest_lat / self.grid_deg),
+            round(dest_lng / self.grid_deg),
+        )
+
+    def ttl(self, now: datetime | None = None) -> float:
+        hour = (now or datetime.now()).hour
+        return self.peak_ttl_s if hour in self.peak_hours else self.ttl_s
+
+    async def get(self, key: RouteKey) -> Route | None:
+        now = time.time()
+        entry = self._entries.get(key)
+        from_memory = entry is not None
+        if entry is None and self._db is not None:
+            entry = await asyncio.to_thread(self._load, key)
+        if entry is not None:
+            expires_at, route = entry
+            if expires_at > now:
+                if from_memory:
+                    self._entries.move_to_end(key)
+                else:
+                    self._store(key, entry)
+                self.hits += 1
+                return route
+            self._entries.pop(key, None)
+            self.expirations += 1
+            if self._db is not None:
+                await asyncio.to_thread(self._delete, key)
+        self.misses += 1
+        return None
+
+    async def put(self, key: RouteKey, eta: int, path: list[tuple[float, float]]) -> None:
+        entry = (time.time() + self.ttl(), (eta, path))
+        self._store(key, entry)
+        if self._db is not None:
+            await asyncio.to_thread(self._save, key, entry)
+
+    def _store(self, key: RouteKey, entry: tuple[float, Route]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _load(self, key: RouteKey) -> tuple[float, Route] | None:
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT expires_at, eta, path FROM routes WHERE key = ?", (repr(key),)
+                ).fetchone()
+            if row is None:
+                return None
+            expires_at, eta, path = row
+            return expires_at, (eta, [tuple(point) for point in orjson.loads(path)])
+        except (sqlite3.Error, orjson.JSONDecodeError, TypeError, ValueError) as e:
+            logger.warning("Route cache read failed: %s", e)
+            return None
+
+    def _delete(self, key: RouteKey) -> None:
+        try:
+            with self._db_lock:
+                self._db.execute("DELETE FROM routes WHERE key = ?", (repr(key),))
+                self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning("Route cache delete failed: %s", e)
+
+    def _prune(self) -> None:
+        with self._db_lock:
+            self._db.execute("DELETE FROM routes WHERE expires_at <= ?", (time.time(),))
+            self._db.commit()
+
+    def _save(self, key: RouteKey, entry: tuple[float, Route]) -> None:
+        expires_at, (eta, path) = entry
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO routes VALUES (?, ?, ?, ?)",
+                    (repr(key), expires_at, eta, orjson.dumps(path)),
+                )
+                self._db.commit()
+            self._writes += 1
+            if self._writes % ROUTE_CACHE_PRUNE_EVERY == 0:
+                self._prune()
+        except sqlite3.Error as e:
+            logger.warning("Route cache write failed: %s", e)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+route_cache = RouteCache()
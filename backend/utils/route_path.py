@@ -0,0 +1,129 @@
+"""Ambulance paths as encoded polylines.
+
+``Ambulance.path`` holds the leg being driven as a Google encoded polyline
+(precision 5, ~1 m) and ``Ambulance.path_index`` the number of its points
+already driven, so a simulation tick only moves the cursor instead of
+rewriting and re-broadcasting the remaining points. Decode only where the
+points are needed.
+
+Routes are simplified (Douglas-Peucker) before they are stored, and the
+simulation resamples them to evenly spaced positions, so the number of ticks
+follows the trip time rather than how dense the provider's polyline is.
+"""
+
+import math
+import os
+from typing import Iterable
+
+import numpy as np
+import polyline
+
+from schemas import Point
+from utils.geo import EARTH_RADIUS_KM, calculate_distance
+
+PATH_PRECISION = 5
+# Vertices closer than this to the simplified line are dropped
+PATH_SIMPLIFY_TOLERANCE_M = float(os.getenv("PATH_SIMPLIFY_TOLERANCE_M", "5"))
+
+
+def _coordinates(points: Iterable[Point | tuple[float, float] | dict]) -> list[tuple[float, float]]:
+    coordinates = []
+    for point in points:
+        if isinstance(point, Point):
+            coordinates.append((point.lat, point.lng))
+        elif isinstance(point, dict):
+            coordinates.append((point["lat"], point["lng"]))
+        else:
+            coordinates.append((point[0], point[1]))
+    return coordinates
+
+
+def encode_path(points: Iterable[Point | tuple[float, float] | dict]) -> str:
+    return polyline.encode(_coordinates(points), PATH_PRECISION)
+
+
+def decode_path(encoded: str | None) -> list[tuple[float, float]]:
+    return polyline.decode(encoded, PATH_PRECISION) if encoded else []
+
+
+def _local_metres(points: list[tuple[float, float]]) -> np.ndarray:
+    """Equirectangular projection around the first point, in metres."""
+    coords = np.radians(np.asarray(points, dtype=np.float64))
+    lat0 = coords[0, 0]
+    x = (coords[:, 1] - coords[0, 1]) * math.cos(lat0)
+    y = coords[:, 0] - lat0
+    return np.column_stack((x, y)) * EARTH_RADIUS_KM * 1000
+
+
+def simplify_path(
+    points: list[tuple[float, float]], tolerance_m: float = PATH_SIMPLIFY_TOLERANCE_M
+) -> list[tuple[float, float]]:
+    """Douglas-Peucker: keep the vertices that deviate more than ``tolerance_m``."""
+    if len(points) < 3 or tolerance_m <= 0:
+        return list(points)
+    xy = _local_metres(points)
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = xy[end] - xy[start]
+        offsets = xy[start + 1 : end] - xy[start]
+        length = math.hypot(*segment)
+        if length == 0:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            # Distance to the segment, clamped to its end points
+            t = np.clip(offsets @ segment / length**2, 0, 1)
+            nearest = np.outer(t, segment)
+            distances = np.hypot(*(offsets - nearest).T)
+        farthest = int(distances.argmax())
+        if distances[farthest] > tolerance_m:
+            split = start + 1 + farthest
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def path_length_km(points: list[tuple[float, float]]) -> float:
+    return sum(calculate_distance(*a, *b) for a, b in zip(points, points[1:]))
+
+
+def resample_path(
+    points: list[tuple[float, float]], count: int
+) -> list[tuple[float, float, int]]:
+    """``count`` positions evenly spaced by distance after the start of ``points``.
+
+    Each position is ``(lat, lng, path_index)``, where ``path_index`` is the
+    number of vertices of ``points`` reached so far; the last position is
+    the end of the path.
+    """
+    if not points or count < 1:
+        return []
+    cumulative = [0.0]
+    for a, b in zip(points, points[1:]):
+        cumulative.append(cumulative[-1] + calculate_distance(*a, *b))
+    total = cumulative[-1]
+    positions = []
+    vertex = 0
+    for step in range(1, count + 1):
+        target = total * step / count
+        while vertex + 1 < len(points) - 1 and cumulative[vertex + 1] <= target:
+            vertex += 1
+        if step == count or total == 0:
+            positions.append((*points[-1], len(points)))
+            continue
+        start, end = points[vertex], points[vertex + 1]
+        span = cumulative[vertex + 1] - cumulative[vertex]
+        f = (target - cumulative[vertex]) / span if span else 1.0
+        positions.append(
+            (
+                start[0] + (end[0] - start[0]) * f,
+                start[1] + (end[1] - start[1]) * f,
+                vertex + 1,
+            )
+        )
+    return positions
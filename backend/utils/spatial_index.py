@@ -0,0 +1,106 @@
+import heapq
+import math
+import os
+from typing import Generic, Hashable, TypeVar
+
+from utils.geo import EARTH_RADIUS_KM, calculate_distance
+
+# Grid cell size in degrees (~1.1 km north-south at 0.01)
+SPATIAL_INDEX_CELL_DEG = float(os.getenv("SPATIAL_INDEX_CELL_DEG", "0.01"))
+
+KM_PER_DEG = math.pi * EARTH_RADIUS_KM / 180
+
+K = TypeVar("K", bound=Hashable)
+
+
+class SpatialIndex(Generic[K]):
+    """Uniform lat/lng grid of points answering k-nearest queries.
+
+    Points are moved in O(1). A query scans rings of cells outward from the
+    query point and stops as soon as no unscanned cell can hold anything
+    closer than the k-th best found, so it only touches the neighbourhood.
+    """
+
+    def __init__(self, cell_deg: float = SPATIAL_INDEX_CELL_DEG) -> None:
+        self.cell_deg = cell_deg
+        self._cells: dict[tuple[int, int], dict[K, tuple[float, float]]] = {}
+        self._where: dict[K, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._where
+
+    def _cell(self, lat: float, lng: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg)
+
+    def upsert(self, key: K, lat: float, lng: float) -> None:
+        cell = self._cell(lat, lng)
+        previous = self._where.get(key)
+        if previous is not None and previous != cell:
+            self._discard(key, previous)
+        self._cells.setdefault(cell, {})[key] = (lat, lng)
+        self._where[key] = cell
+
+    def remove(self, key: K) -> None:
+        cell = self._where.pop(key, None)
+        if cell is not None:
+            self._discard(key, cell)
+
+    def _discard(self, key: K, cell: tuple[int, int]) -> None:
+        points = self._cells[cell]
+        del points[key]
+        if not points:
+            del self._cells[cell]
+
+    def nearest(self, lat: float, lng: float, k: int = 1) -> list[tuple[float, K]]:
+        """Return up to ``k`` (distance_km, key) pairs, closest first."""
+        if not self._where or k <= 0:
+            return []
+        k = min(k, len(self._where))
+        center_i, center_j = self._cell(lat, lng)
+
+        best: list[tuple[float, K]] = []  # max-heap via negated distances
+        ring = 0
+        while True:
+            # Past this many cells a plain scan of every point is cheaper
+            if (2 * ring + 1) ** 2 > 4 * len(self._where) + 16:
+                return self._scan_all(lat, lng, k)
+            for cell in _ring_cells(center_i, center_j, ring):
+                for key, (plat, plng) in self._cells.get(cell, {}).items():
+                    distance = calculate_distance(lat, lng, plat, plng)
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, key))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, key))
+            # Anything beyond this ring is at least ring cells away
+            if len(best) == k and -best[0][0] <= ring * self._min_cell_km(lat, ring):
+                break
+            ring += 1
+        return sorted((-neg, key) for neg, key in best)
+
+    def _min_cell_km(self, lat: float, ring: int) -> float:
+        """Narrowest cell width (km) within ``ring`` cells of latitude ``lat``."""
+        farthest = min(abs(lat) + (ring + 1) * self.cell_deg, 89.9)
+        return self.cell_deg * KM_PER_DEG * math.cos(math.radians(farthest))
+
+    def _scan_all(self, lat: float, lng: float, k: int) -> list[tuple[float, K]]:
+        distances = (
+            (calculate_distance(lat, lng, plat, plng), key)
+            for points in self._cells.values()
+            for key, (plat, plng) in points.items()
+        )
+        return heapq.nsmallest(k, distances)
+
+
+def _ring_cells(i: int, j: int, ring: int):
+    if ring == 0:
+        yield i, j
+        return
+    for dj in range(-ring, ring + 1):
+        yield i - ring, j + dj
+        yield i + ring, j + dj
+    for di in range(-ring + 1, ring):
+        yield i + di, j - ring
+        yield i + di, j + ring
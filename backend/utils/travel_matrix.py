@@ -0,0 +1,193 @@
+"""Precomputed station-to-grid travel times for first-pass dispatch ETAs.
+
+The build step routes from every station (ambulance homes and hospitals)
+to the centre of every cell of a grid covering the service area and writes
+
+    <TRAVEL_MATRIX_PATH>.npy    float32 seconds, shape (stations, rows, cols)
+    <TRAVEL_MATRIX_PATH>.json   grid bounds, cell size and the station list
+
+The array is opened memory-mapped, so a lookup is one index into the page
+cache. Build it from the backend folder with
+
+    python -m utils.travel_matrix [--source routes|straight]
+
+``routes`` asks the live Routes API (needs GOOGLE_MAPS_API_KEY); cells it
+cannot route, or skips while rate-limited or failing, are left NaN.
+``straight`` estimates from straight-line distance for development.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import numpy as np
+
+from utils.geo import calculate_distance, estimate_travel_seconds
+
+logger = logging.getLogger(__name__)
+
+TRAVEL_MATRIX_PATH = os.getenv("TRAVEL_MATRIX_PATH", "data/travel_matrix")
+TRAVEL_MATRIX_CELL_DEG = float(os.getenv("TRAVEL_MATRIX_CELL_DEG", "0.005"))
+# Padding around the stations and cameras that defines the service area
+TRAVEL_MATRIX_MARGIN_DEG = float(os.getenv("TRAVEL_MATRIX_MARGIN_DEG", "0.03"))
+TRAVEL_MATRIX_CONCURRENCY = int(os.getenv("TRAVEL_MATRIX_CONCURRENCY", "8"))
+# Speed for the legs the matrix does not cover (ambulance to its station)
+APPROACH_SPEED_KMH = 30.0
+
+TravelTime = Callable[[float, float, float, float], Awaitable[float | None]]
+
+
+class TravelTimeMatrix:
+    def __init__(self, seconds: np.ndarray, meta: dict) -> None:
+        self.seconds = seconds
+        self.cell_deg = meta["cell_deg"]
+        self.south = meta["south"]
+        self.west = meta["west"]
+        self.rows, self.cols = seconds.shape[1:]
+        self.stations = [(s["lat"], s["lng"]) for s in meta["stations"]]
+
+    @classmethod
+    def open(cls, path: str = TRAVEL_MATRIX_PATH) -> "TravelTimeMatrix | None":
+        array_path, meta_path = Path(f"{path}.npy"), Path(f"{path}.json")
+        if not array_path.exists() or not meta_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text())
+        return cls(np.load(array_path, mmap_mode="r"), meta)
+
+    def cell(self, lat: float, lng: float) -> tuple[int, int] | None:
+        row = math.floor((lat - self.south) / self.cell_deg)
+        col = math.floor((lng - self.west) / self.cell_deg)
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None
+
+    def nearest_station(self, lat: float, lng: float) -> tuple[int, float]:
+        """(station index, distance_km) of the station closest to a point."""
+        distances = [calculate_distance(lat, lng, s_lat, s_lng) for s_lat, s_lng in self.stations]
+        station = min(range(len(distances)), key=distances.__getitem__)
+        return station, distances[station]
+
+    def eta(self, from_lat: float, from_lng: float, to_lat: float, to_lng: float) -> float | None:
+        """Road ETA in seconds via the station nearest the origin, or None.
+
+        The origin-to-station leg is estimated at APPROACH_SPEED_KMH; idle
+        ambulances normally sit at their station, so it is usually ~0.
+        """
+        cell = self.cell(to_lat, to_lng)
+        if cell is None:
+            return None
+        station, approach_km = self.nearest_station(from_lat, from_lng)
+        seconds = float(self.seconds[station, cell[0], cell[1]])
+        if math.isnan(seconds):
+            return None
+        return seconds + approach_km / APPROACH_SPEED_KMH * 3600
+
+
+def service_area(points: list[tuple[float, float]], margin_deg: float) -> tuple[float, float, float, float]:
+    lats = [lat for lat, _ in points]
+    lngs = [lng for _, lng in points]
+    return (
+        min(lats) - margin_deg,
+        min(lngs) - margin_deg,
+        max(lats) + margin_deg,
+        max(lngs) + margin_deg,
+    )
+
+
+async def build_matrix(
+    stations: list[dict],
+    bounds: tuple[float, float, float, float],
+    travel_time: TravelTime,
+    cell_deg: float = TRAVEL_MATRIX_CELL_DEG,
+    concurrency: int = TRAVEL_MATRIX_CONCURRENCY,
+) -> tuple[np.ndarray, dict]:
+    """Travel time from every station to every cell centre (NaN if unroutable)."""
+    south, west, north, east = bounds
+    rows = max(1, math.ceil((north - south) / cell_deg))
+    cols = max(1, math.ceil((east - west) / cell_deg))
+    seconds = np.full((len(stations), rows, cols), np.nan, dtype=np.float32)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fill(station: int, row: int, col: int) -> None:
+        async with semaphore:
+            value = await travel_time(
+                stations[station]["lat"],
+                stations[station]["lng"],
+                south + (row + 0.5) * cell_deg,
+                west + (col + 0.5) * cell_deg,
+            )
+        if value is not None:
+            seconds[station, row, col] = value
+
+    await asyncio.gather(
+        *(
+            fill(station, row, col)
+            for station in range(len(stations))
+            for row in range(rows)
+            for col in range(cols)
+        )
+    )
+    meta = {
+        "cell_deg": cell_deg,
+        "south": south,
+        "west": west,
+        "stations": stations,
+    }
+    return seconds, meta
+
+
+def save_matrix(seconds: np.ndarray, meta: dict, path: str = TRAVEL_MATRIX_PATH) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    np.save(f"{path}.npy", seconds)
+    Path(f"{path}.json").write_text(json.dumps(meta, indent=2))
+
+
+async def straight_travel_time(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    return estimate_travel_seconds(lat1, lng1, lat2, lng2)
+
+
+async def routes_travel_time(lat1: float, lng1: float, lat2: float, lng2: float) -> float | None:
+    from maps_call import compute_route_eta_and_path
+
+    # Straight-line estimates would pass for road ETAs; leave those cells NaN
+    eta, _ = await compute_route_eta_and_path(lat1, lng1, lat2, lng2, estimate=False)
+    return eta
+
+
+async def main() -> None:
+    from seed_data import AMBULANCES_DATA, CAMERAS_DATA, HOSPITALS_DATA
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", choices=["routes", "straight"], default="routes")
+    parser.add_argument("--path", default=TRAVEL_MATRIX_PATH)
+    args = parser.parse_args()
+
+    stations = [
+        {"name": place["name"], "lat": place["lat"], "lng": place["lng"]}
+        for place in AMBULANCES_DATA + HOSPITALS_DATA
+    ]
+    bounds = service_area(
+        [(p["lat"], p["lng"]) for p in stations + CAMERAS_DATA], TRAVEL_MATRIX_MARGIN_DEG
+    )
+    travel_time = routes_travel_time if args.source == "routes" else straight_travel_time
+    seconds, meta = await build_matrix(stations, bounds, travel_time)
+    save_matrix(seconds, meta, args.path)
+    logger.info(
+        "Wrote %s stations x %s x %s cells to %s (%s unroutable)",
+        *seconds.shape,
+        args.path,
+        int(np.isnan(seconds).sum()),
+    )
+
+
+travel_matrix = TravelTimeMatrix.open()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+import math
+import os
+from typing import Generic, Hashable, TypeVar
+
+from schemas import BoundingBox
+
+# Grid cell size (degrees) used to look up which viewports contain a point
+VIEWPORT_CELL_DEG = float(os.getenv("LIVE_WS_VIEWPORT_CELL_DEG", "0.01"))
+# Viewports spanning more cells than this are checked directly instead
+MAX_CELLS_PER_VIEWPORT = 4096
+
+K = TypeVar("K", bound=Hashable)
+
+
+class ViewportIndex(Generic[K]):
+    """Uniform lat/lng grid mapping each cell to the viewports overlapping it.
+
+    A point lookup touches one cell plus the (usually tiny) set of city-wide
+    viewports, so routing an entity costs the same at 10 or 10,000 sockets.
+    """
+
+    def __init__(self, cell_deg: float = VIEWPORT_CELL_DEG) -> None:
+        self.cell_deg = cell_deg
+        self._cells: dict[tuple[int, int], set[K]] = {}
+        self._wide: set[K] = set()
+        self._boxes: dict[K, BoundingBox] = {}
+
+    def _cell(self, lat: float, lng: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg)
+
+    def _cells_of(self, bbox: BoundingBox) -> list[tuple[int, int]] | None:
+        lat_lo, lng_lo = self._cell(bbox.south, bbox.west)
+        lat_hi, lng_hi = self._cell(bbox.north, bbox.east)
+        if (lat_hi - lat_lo + 1) * (lng_hi - lng_lo + 1) > MAX_CELLS_PER_VIEWPORT:
+            return None
+        return [
+            (i, j)
+            for i in range(lat_lo, lat_hi + 1)
+            for j in range(lng_lo, lng_hi + 1)
+        ]
+
+    def add(self, key: K, bbox: BoundingBox) -> None:
+        self.remove(key)
+        self._boxes[key] = bbox
+        cells = self._cells_of(bbox)
+        if cells is None:
+            self._wide.add(key)
+            return
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key: K) -> None:
+        bbox = self._boxes.pop(key, None)
+        if bbox is None:
+            return
+        self._wide.discard(key)
+        for cell in self._cells_of(bbox) or []:
+            keys = self._cells.get(cell)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._cells[cell]
+
+    def query(self, lat: float, lng: float) -> set[K]:
+        """Return every key whose viewport contains (lat, lng)."""
+        candidates = self._cells.get(self._cell(lat, lng), set()) | self._wide
+        return {key for key in candidates if self._boxes[key].contains(lat, lng)}
@@ -1,6 +1,7 @@
 import { useMemo } from "react";
 import { Layer, Source, type LayerProps } from "react-map-gl/maplibre";
 import type { Ambulance, Point } from "../../types";
+import { remainingPath } from "./decodePath";
 
 type AmbulancePathProps = {
   ambulance: Ambulance;
@@ -56,7 +57,10 @@ const colorFromId = (id: string) => {
 const mapPoint = (point: Point) => [point.lng, point.lat] as [number, number];
 
 export default function AmbulancePath({ ambulance }: AmbulancePathProps) {
-  const path = ambulance.path ?? [];
+  const path = useMemo(
+    () => remainingPath(ambulance.path, ambulance.path_index),
+    [ambulance.path, ambulance.path_index],
+  );
   const hasPath = path.length > 0;
 
   const { core, glow } = useMemo(
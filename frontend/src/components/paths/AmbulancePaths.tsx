@@ -1,6 +1,7 @@
 import { useMemo } from "react";
 import { Layer, Source, type LayerProps } from "react-map-gl/maplibre";
 import type { Ambulance, Point } from "../../types";
+import { remainingPath } from "./decodePath";
 
 type AmbulancePathsProps = {
   ambulances: Ambulance[];
@@ -70,9 +71,12 @@ const mapPoint = (point: Point) => [point.lng, point.lat] as [number, number];
 export default function AmbulancePaths({ ambulances }: AmbulancePathsProps) {
   const features = useMemo<LineFeature[]>(() => {
     return ambulances
-      .filter((ambulance) => ambulance.path && ambulance.path.length > 0)
-      .map((ambulance) => {
-        const path = ambulance.path ?? [];
+      .map((ambulance) => ({
+        ambulance,
+        path: remainingPath(ambulance.path, ambulance.path_index),
+      }))
+      .filter(({ path }) => path.length > 0)
+      .map(({ ambulance, path }) => {
         const { core, glow } = colorFromId(String(ambulance._id));
         const coordinates = [
           [ambulance.lng, ambulance.lat] as [number, number],
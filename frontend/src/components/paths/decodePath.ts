@@ -0,0 +1,52 @@
+import type { Point } from "../../types";
+
+// Ambulance paths arrive as Google encoded polylines (precision 5) plus a
+// cursor of points already driven. A route is decoded once and reused for
+// every position update of the leg.
+const decoded = new Map<string, Point[]>();
+const MAX_DECODED = 256;
+
+export function decodePolyline(encoded: string): Point[] {
+  const points: Point[] = [];
+  let index = 0;
+  let lat = 0;
+  let lng = 0;
+
+  const next = () => {
+    let result = 0;
+    let shift = 0;
+    let byte: number;
+    do {
+      byte = encoded.charCodeAt(index) - 63;
+      index += 1;
+      result |= (byte & 0x1f) << shift;
+      shift += 5;
+    } while (byte >= 0x20);
+    return result & 1 ? ~(result >> 1) : result >> 1;
+  };
+
+  while (index < encoded.length) {
+    lat += next();
+    lng += next();
+    points.push({ lat: lat / 1e5, lng: lng / 1e5 });
+  }
+  return points;
+}
+
+export function remainingPath(
+  encoded: string | null | undefined,
+  pathIndex = 0,
+): Point[] {
+  if (!encoded) {
+    return [];
+  }
+  let points = decoded.get(encoded);
+  if (!points) {
+    if (decoded.size >= MAX_DECODED) {
+      decoded.clear();
+    }
+    points = decodePolyline(encoded);
+    decoded.set(encoded, points);
+  }
+  return points.slice(pathIndex);
+}
@@ -3,11 +3,34 @@ import { useQueryClient } from "@tanstack/react-query";
 import type { Ambulance, Camera, Event } from "../types";
 
 const WS_URL = "ws://localhost:8000/ws/live";
+const RECONNECT_DELAY_MS = 1000;
 
+const LIVE_ENTITY_TYPES = ["ambulances", "events", "cameras"] as const;
+
+type LiveEntityType = (typeof LIVE_ENTITY_TYPES)[number];
+
+/**
+ * Versioned delta protocol: every message carries a monotonically
+ * increasing `seq` and either upserted documents or removed ids.
+ */
 type LiveMessage =
-  | { type: "ambulances"; data: Ambulance[] }
-  | { type: "events"; data: Event[] }
-  | { type: "cameras"; data: Camera[] };
+  | { type: LiveEntityType; op: "upsert"; seq: number; data: LiveEntity[] }
+  | { type: LiveEntityType; op: "remove"; seq: number; ids: string[] };
+
+/**
+ * Sent first on every connection: either the full state, or confirmation
+ * that the missed deltas since `seq` follow.
+ */
+type LiveControlMessage =
+  | {
+      op: "snapshot";
+      epoch: string;
+      seq: number;
+      data: Record<LiveEntityType, LiveEntity[]>;
+    }
+  | { op: "resume"; epoch: string; seq: number };
+
+type LiveEntity = Ambulance | Event | Camera;
 
 type LiveStatus = "connecting" | "open" | "closed" | "error";
 
@@ -36,66 +59,105 @@ function normalizeArray<T extends { _id?: unknown; id?: unknown }>(
   return items.map(normalizeId);
 }
 
+/**
+ * Apply a delta message to a cached entity list.
+ */
+function applyDelta<T extends { _id?: unknown; id?: unknown }>(
+  current: T[] | undefined,
+  message: LiveMessage,
+): T[] {
+  const byId = new Map<unknown, T>();
+  for (const item of current ?? []) {
+    byId.set(item.id ?? item._id, item);
+  }
+
+  if (message.op === "upsert") {
+    for (const item of normalizeArray(message.data as unknown as T[])) {
+      byId.set(item.id, item);
+    }
+  } else {
+    for (const id of message.ids) {
+      byId.delete(id);
+    }
+  }
+
+  return Array.from(byId.values());
+}
+
 export function useLiveData() {
   const queryClient = useQueryClient();
   const socketRef = useRef<WebSocket | null>(null);
   const [status, setStatus] = useState<LiveStatus>("connecting");
 
   useEffect(() => {
-    const ws = new WebSocket(WS_URL);
-    socketRef.current = ws;
-
-    ws.onopen = () => {
-      setStatus("open");
-      console.info("[Live] WebSocket connected");
-    };
-
-    ws.onclose = () => {
-      setStatus("closed");
-      console.info("[Live] WebSocket disconnected");
-    };
-
-    ws.onerror = () => {
-      setStatus("error");
-      console.warn("[Live] WebSocket error");
-    };
-
-    ws.onmessage = (event) => {
-      console.log("[Live] Message received:", event.data);
-
-      try {
-        const message = JSON.parse(event.data) as LiveMessage;
-
-        if (message.type === "ambulances") {
-          queryClient.setQueryData<Ambulance[]>(
-            ["ambulances"],
-            normalizeArray(message.data),
-          );
-          return;
-        }
-
-        if (message.type === "events") {
-          queryClient.setQueryData<Event[]>(
-            ["events"],
-            normalizeArray(message.data),
-          );
-          return;
+    let unmounted = false;
+    let reconnectTimer: ReturnType<typeof setTimeout> | undefined;
+    // Position in the server's stream, presented again on reconnect
+    const cursor: { epoch?: string; seq?: number } = {};
+
+    const connect = () => {
+      const url =
+        cursor.epoch !== undefined && cursor.seq !== undefined
+          ? `${WS_URL}?epoch=${cursor.epoch}&since=${cursor.seq}`
+          : WS_URL;
+      const ws = new WebSocket(url);
+      socketRef.current = ws;
+
+      ws.onopen = () => {
+        setStatus("open");
+        console.info("[Live] WebSocket connected");
+      };
+
+      ws.onclose = () => {
+        setStatus("closed");
+        console.info("[Live] WebSocket disconnected");
+        if (!unmounted) {
+          reconnectTimer = setTimeout(connect, RECONNECT_DELAY_MS);
         }
-
-        if (message.type === "cameras") {
-          queryClient.setQueryData<Camera[]>(
-            ["cameras"],
-            normalizeArray(message.data),
-          );
-          return;
+      };
+
+      ws.onerror = () => {
+        setStatus("error");
+        console.warn("[Live] WebSocket error");
+      };
+
+      ws.onmessage = (event) => {
+        console.log("[Live] Message received:", event.data);
+
+        try {
+          const message = JSON.parse(event.data) as
+            | LiveMessage
+            | LiveControlMessage;
+
+          if (message.op === "snapshot") {
+            for (const type of LIVE_ENTITY_TYPES) {
+              queryClient.setQueryData<LiveEntity[]>(
+                [type],
+                normalizeArray(message.data[type] ?? []),
+              );
+            }
+          } else if (message.op === "upsert" || message.op === "remove") {
+            queryClient.setQueryData<LiveEntity[]>([message.type], (current) =>
+              applyDelta(current, message),
+            );
+          }
+
+          if ("epoch" in message) {
+            cursor.epoch = message.epoch;
+          }
+          cursor.seq = message.seq;
+        } catch (error) {
+          console.warn("[Live] Failed to parse message", error);
         }
-      } catch (error) {
-        console.warn("[Live] Failed to parse message", error);
-      }
+      };
     };
 
+    connect();
+
     return () => {
-      ws.close();
+      unmounted = true;
+      clearTimeout(reconnectTimer);
+      socketRef.current?.close();
     };
   }, [queryClient]);
 
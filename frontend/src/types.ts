@@ -41,7 +41,9 @@ export type Ambulance = {
   event_id: number | null;
   eta_seconds?: number | null;
   updated_at: string;
-  path?: Point[] | null;
+  // Encoded polyline of the current leg; path_index points already driven
+  path?: string | null;
+  path_index?: number;
 };
 
 export type Hospital = {
@@ -76,4 +78,9 @@ export type Statistics = {
     eta_seconds: number | null;
     events_handled: number;
   }>;
+  coverage: {
+    radius_km: number;
+    cameras_total: number;
+    cameras_covered: number;
+  };
 };